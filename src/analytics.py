@@ -0,0 +1,203 @@
+""" 수집 결과(ItemRow) → 상점/기간별 KPI 요약 (pandas 컬럼 연산, 행 단위 루프 없음) """
+from __future__ import annotations
+
+import os
+import re
+import argparse
+from typing import Iterable, List, Optional
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+
+from item import ItemRow
+
+TOP_N = 3
+SUMMARY_SHEET = "summary"
+INDEX_SHEET = "index"    # 분할 저장 시 인덱스 워크북(상점 → 분할 파일)
+ALL_SHOPS = "(전체)"
+
+# 엑셀(ranking 시트) 헤더 → 분석용 컬럼명
+EXPORT_COLUMNS = {
+    "Rank": "rank",
+    "Name": "name",
+    "Price(JPY)": "price_jpy",
+    "Price(KRW)": "price_krw",
+    "Reviews": "review_count",
+    "Product URL": "product_url",
+    "Shop": "shop",
+}
+
+SUMMARY_HEADERS = {
+    "period": "Period",
+    "run": "Run",
+    "shop": "Shop",
+    "items": "Items",
+    "median_price_jpy": "Median Price(JPY)",
+    "median_price_krw": "Median Price(KRW)",
+    "mean_price_jpy": "Mean Price(JPY)",
+    "review_total": "Reviews Total",
+    "top_review_share": f"Top{TOP_N} Review Share",
+    "top_price_share": f"Top{TOP_N} Sales-Price Share",
+}
+
+def run_key(path: str) -> str:
+    """ 파일명의 실행 시각(qoo10_top5_2025-09-01_120000...) → 실행 구분 키. 없으면 파일명 """
+    name = os.path.splitext(os.path.basename(path))[0]
+    m = re.search(r"\d{4}-\d{2}-\d{2}_\d{6}", name)
+    return m.group(0) if m else name
+
+def items_to_frame(items: Iterable[ItemRow], period: str, run: str = "") -> pd.DataFrame:
+    """ ItemRow 목록 → 컬럼 단위 DataFrame. rank 는 상점 내 등장 순서(1부터) """
+    items = list(items)
+    df = pd.DataFrame({
+        "period": period,
+        "run": run,
+        "shop": [r.shop_name for r in items],
+        "name": [r.name for r in items],
+        "price_jpy": pd.array([r.price_jpy for r in items], dtype="int64"),
+        "price_krw": pd.array([r.price_krw for r in items], dtype="float64"),
+        "review_count": pd.array([r.review_count for r in items], dtype="int64"),
+        "product_url": [r.product_url for r in items],
+    })
+    df["rank"] = df.groupby("shop", sort=False).cumcount() + 1
+    return df
+
+def index_parts(path: str, index: Optional[pd.DataFrame] = None) -> List[str]:
+    """ 인덱스 워크북이면 가리키는 분할 파일 경로(존재하는 것만), 아니면 빈 목록 """
+    if index is None:
+        with pd.ExcelFile(path) as xls:
+            if INDEX_SHEET not in xls.sheet_names or "ranking" in xls.sheet_names:
+                return []
+            index = xls.parse(INDEX_SHEET)
+    if "File" not in index:
+        return []
+    base = os.path.dirname(os.path.abspath(path))
+    parts = [os.path.join(base, f) for f in index["File"].dropna().unique()]
+    missing = [p for p in parts if not os.path.exists(p)]
+    if missing:
+        print(f"[WARN] 분할 파일 없음: {', '.join(os.path.basename(p) for p in missing)}")
+    return [p for p in parts if os.path.exists(p)]
+
+def frame_from_export(path: str, period: Optional[str] = None) -> pd.DataFrame:
+    """
+    기존 통합 엑셀(ranking 시트)을 같은 형태의 DataFrame 으로 읽는다.
+    period 를 안 주면 summary 시트의 Period, 파일명의 _D_/_W_/_M_ 표기 순으로 찾고 없으면 "?" 로 둔다.
+    run 은 파일명의 실행 시각 → 같은 기간의 다른 실행(예: 다른 주의 W 파일)이 한 그룹으로 합쳐지지 않는다.
+    """
+    sheets = pd.read_excel(path, sheet_name=None)
+    if "ranking" not in sheets and INDEX_SHEET in sheets:
+        # 분할 저장 인덱스 → 분할 파일들의 ranking 시트를 이어서 읽음
+        parts = index_parts(path, sheets[INDEX_SHEET])
+        if not parts:
+            return pd.DataFrame(columns=[*EXPORT_COLUMNS.values(), "period", "run"])
+        return pd.concat([frame_from_export(p, period) for p in parts], ignore_index=True)
+    df = sheets["ranking"][list(EXPORT_COLUMNS)].rename(columns=EXPORT_COLUMNS)
+    if period is None:
+        prev = sheets.get(SUMMARY_SHEET)
+        m = re.search(r"_([DWM])_", os.path.basename(path))
+        if prev is not None and SUMMARY_HEADERS["period"] in prev and len(prev):
+            period = str(prev[SUMMARY_HEADERS["period"]].iloc[0])
+        else:
+            period = m.group(1) if m else "?"
+    df["period"] = period
+    df["run"] = run_key(path)
+    df["price_jpy"] = pd.to_numeric(df["price_jpy"], errors="coerce").fillna(0).astype("int64")
+    df["price_krw"] = pd.to_numeric(df["price_krw"], errors="coerce").fillna(0.0)
+    df["review_count"] = pd.to_numeric(df["review_count"], errors="coerce").fillna(0).astype("int64")
+    return df
+
+def summarize(df: pd.DataFrame, top_n: int = TOP_N) -> pd.DataFrame:
+    """
+    (period, run, shop) 별 KPI + 실행별 전체 합계 행.
+    top_review_share: 상위 top_n 순위 상품이 차지하는 리뷰 비중
+    top_price_share:  상위 top_n 순위 상품이 차지하는 가격 합 비중
+    """
+    if df.empty:
+        return pd.DataFrame(columns=list(SUMMARY_HEADERS))
+    is_top = df["rank"] <= top_n
+    work = df.assign(
+        top_reviews=df["review_count"].where(is_top, 0),
+        top_price=df["price_jpy"].where(is_top, 0),
+    )
+
+    def _agg(keys: List[str]) -> pd.DataFrame:
+        g = work.groupby(keys, sort=False)
+        out = g.agg(
+            items=("price_jpy", "size"),
+            median_price_jpy=("price_jpy", "median"),
+            median_price_krw=("price_krw", "median"),
+            mean_price_jpy=("price_jpy", "mean"),
+            review_total=("review_count", "sum"),
+            top_reviews=("top_reviews", "sum"),
+            price_total=("price_jpy", "sum"),
+            top_price=("top_price", "sum"),
+        ).reset_index()
+        return out
+
+    per_shop = _agg(["period", "run", "shop"])
+    per_run = _agg(["period", "run"]).assign(shop=ALL_SHOPS)
+    out = pd.concat([per_shop, per_run], ignore_index=True)
+
+    out["median_price_krw"] = out["median_price_krw"].round(0)
+    out["top_review_share"] = (out["top_reviews"] / out["review_total"].where(out["review_total"] > 0)).fillna(0.0)
+    out["top_price_share"] = (out["top_price"] / out["price_total"].where(out["price_total"] > 0)).fillna(0.0)
+    out["mean_price_jpy"] = out["mean_price_jpy"].round(0)
+    return out[list(SUMMARY_HEADERS)]
+
+def write_summary_sheet(work_book: Workbook, summary: pd.DataFrame, title: str = SUMMARY_SHEET) -> None:
+    """ 요약 DataFrame → 워크북의 별도 시트 (값은 itertuples 로 한 번에 append) """
+    ws = work_book.create_sheet(title)
+    ws.append([SUMMARY_HEADERS[c] for c in summary.columns])
+    for row in summary.itertuples(index=False, name=None):
+        ws.append(list(row))
+
+    header_fill = PatternFill("solid", fgColor="F3F6FA")
+    header_font = Font(bold=True, color="1F2937")
+    header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_align
+    ws.freeze_panes = "A2"
+
+    # 열 단위 서식(숫자/비율)
+    formats = {"items": "0", "median_price_jpy": "#,##0", "median_price_krw": "#,##0",
+               "mean_price_jpy": "#,##0", "review_total": "#,##0",
+               "top_review_share": "0.0%", "top_price_share": "0.0%"}
+    for col_idx, col in enumerate(summary.columns, start=1):
+        letter = get_column_letter(col_idx)
+        ws.column_dimensions[letter].width = 22 if col in ("shop", "run") else 16
+        fmt = formats.get(col)
+        if fmt:
+            for (cell,) in ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx):
+                cell.number_format = fmt
+
+def add_summary_sheet(work_book: Workbook, items: Iterable[ItemRow], period: str, run: str = "") -> pd.DataFrame:
+    """ run: 실행 구분 키(보통 run_key(엑셀 경로)) """
+    summary = summarize(items_to_frame(items, period, run))
+    write_summary_sheet(work_book, summary)
+    return summary
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="기존 통합 엑셀들로 상점/기간별 요약 만들기")
+    parser.add_argument("paths", nargs="+", help="qoo10_top5_*.xlsx")
+    parser.add_argument("--period", default=None, help="파일명에서 알 수 없을 때 사용할 기간(D/W/M)")
+    parser.add_argument("--out", default="./results/qoo10_summary.xlsx")
+    args = parser.parse_args(argv)
+
+    # 인덱스 워크북이 가리키는 분할 파일이 같이 주어져도(glob) 한 번만 읽는다
+    paths = [os.path.abspath(p) for p in args.paths]
+    covered = {p for path in paths for p in index_parts(path)}
+    paths = [p for p in paths if p not in covered]
+    df = pd.concat([frame_from_export(p, args.period) for p in paths], ignore_index=True)
+    summary = summarize(df)
+    wb = Workbook()
+    wb.remove(wb.active)
+    write_summary_sheet(wb, summary)
+    wb.save(args.out)
+    print(f"[SUMMARY] {len(args.paths)}개 파일, {len(df)}행 → {len(summary)}행: {args.out}")
+
+if __name__ == "__main__":
+    main()
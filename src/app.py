@@ -1,7 +1,10 @@
+import multiprocessing
 from app_builder import AppBuilder
 
 if __name__ == "__main__":
     """ 어플리케이션 시작 포인트 """
+    # exe(PyInstaller)에서 분할 저장 워커 프로세스를 띄울 때 필요
+    multiprocessing.freeze_support()
     builder = AppBuilder()
     builder.make_app()
     builder.exec_app()
\ No newline at end of file
@@ -4,6 +4,7 @@ import FreeSimpleGUI as sg
 import threading
 from app_process import *
 from utils import ensure_dir
+from resilience import CancelToken, SHOP_TIME_BUDGET_SEC
 import webbrowser
 
 # Layout 기본 설정
@@ -22,6 +23,7 @@ class AppBuilder:
         self.total_shops = 0
         self.processed = 0
         self.current_period = "W"
+        self.cancel_token: CancelToken | None = None  # 실행 중인 작업의 중지 토큰
         self.last_clicked_cell = None  # 셀 복사용 좌표
         # ✅ 미리보기 누적 버퍼
         self.preview_rows: list[list] = []  # [["Shop","Name","JPY","KRW","Reviews","URL"] 형태의 데이터 누적]
@@ -59,6 +61,20 @@ class AppBuilder:
         return [
             # 이미지 폴더는 최신 Crawler에선 쓰지 않지만, 기존 UI 호환을 위해 남겨둠(무시됨)
             [sg.Text("엑셀 저장 폴더"), sg.Input("./results", key="-OUTDIR-", size=(40,1)), sg.FolderBrowse(target="-OUTDIR-")],
+            # 방문한 페이지 원본을 저장해 두면 선택자 변경/필드 추가 시 재크롤링 없이 재처리 가능
+            [sg.Checkbox("원본 HTML 스냅샷 보관 (저장 폴더/snapshots)", key="-SNAPSHOT-", default=False),
+             sg.Push(),
+             # 한 브라우저에서 상품 상세 페이지를 동시에 여는 탭 수(1 = 한 페이지씩)
+             sg.Text("상품 탭 수"), sg.Spin([1, 2, 3, 4, 5, 6], initial_value=1, key="-TABS-", size=(3,1))],
+            # 크롬 프로필/디스크 캐시를 실행 간 재사용(JS/CSS/폰트 재다운로드 방지)
+            [sg.Checkbox("크롬 프로필/캐시 재사용", key="-PROFILE-", default=False),
+             # 느린 상점 원인 분석용: 상점별 CPU 프로파일 + WebDriver 명령 통계를 엑셀 옆에 저장
+             sg.Checkbox("성능 프로파일 기록", key="-PERF-", default=False)],
+            # 긴 실행용: 상점 수/용량을 넘을 때마다 엑셀을 나눠 저장(0 = 한 파일)
+            [sg.Text("파일 분할: 상점"), sg.Input("0", key="-SHARD_SHOPS-", size=(4,1)),
+             sg.Text("개 또는"), sg.Input("0", key="-SHARD_MB-", size=(5,1)), sg.Text("MB 마다 (0 = 분할 안 함)")],
+            # 상점 하나에 쓸 최대 시간: 넘으면 그때까지 수집한 행만 기록하고 다음 상점으로
+            [sg.Text("상점별 시간 제한(초)"), sg.Input(str(int(SHOP_TIME_BUDGET_SEC)), key="-BUDGET-", size=(5,1))],
         ]
 
     def update_period_buttons(self, sel: str):
@@ -166,6 +182,26 @@ class AppBuilder:
                     sg.popup_error("상점 이름(또는 URL)을 한 줄에 하나씩 입력하세요.")
                     continue
 
+                try:
+                    shard_shops = int(values["-SHARD_SHOPS-"] or 0)
+                    shard_mb = float(values["-SHARD_MB-"] or 0)
+                except ValueError:
+                    sg.popup_error("파일 분할 기준은 숫자로 입력하세요.")
+                    continue
+                try:
+                    tabs = int(values["-TABS-"] or 1)
+                except ValueError:
+                    sg.popup_error("상품 탭 수는 1~6 사이 숫자로 입력하세요.")
+                    continue
+                tabs = min(6, max(1, tabs))
+                try:
+                    time_budget = float(values["-BUDGET-"] or SHOP_TIME_BUDGET_SEC)
+                    if time_budget <= 0:
+                        raise ValueError(time_budget)
+                except ValueError:
+                    sg.popup_error("상점별 시간 제한은 0보다 큰 숫자(초)로 입력하세요.")
+                    continue
+
                 outdir = values["-OUTDIR-"] or "./results"
                 ensure_dir(outdir)
 
@@ -181,15 +217,22 @@ class AppBuilder:
                 self.log(f"[INFO] 총 {total_shops}개 작업(순차) 시작 / period={self.current_period}")
 
                 # 단일 워커 스레드 시작
+                self.cancel_token = CancelToken()
                 t = threading.Thread(
                     target=run_all_sequential,
-                    args=(self.window, shops, outdir, self.current_period, self.log_q),
+                    args=(self.window, shops, outdir, self.current_period, self.log_q, self.cancel_token,
+                          values["-SNAPSHOT-"], tabs, values["-PROFILE-"],
+                          values["-PERF-"], shard_shops, shard_mb, time_budget),
                     daemon=True
                 )
                 t.start()
 
             if event == "-STOP-" and self.running:
-                self.log("[INFO] 중지 요청됨 (현재 작업이 끝나면 멈춥니다)")
+                # 브라우저를 즉시 닫고, 지금까지 수집한 결과만 저장
+                if self.cancel_token is not None:
+                    self.cancel_token.cancel()
+                self.window["-STOP-"].update(disabled=True)
+                self.log("[INFO] 중지 요청됨 (브라우저 종료 후 수집된 결과까지 저장합니다)")
 
             # 한 상점 완료 시
             if event == "-STEP_DONE-":
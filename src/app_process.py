@@ -4,75 +4,99 @@ import FreeSimpleGUI as sg
 import pandas as pd 
 import traceback
 import os 
-import io
 from datetime import datetime
-from openpyxl.drawing.image import Image as XLImage
-from utils import excel_col_width_to_pixels, pixels_to_row_height_points, autosize_text_columns
-from openpyxl import Workbook
-from item import ItemRow
-from image import Image
-from openpyxl.worksheet.worksheet import Worksheet
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-
-def run_all_sequential(window: sg.Window, shops: list[str], outdir: str, period: str, log_q: queue.Queue) -> None:
-    """ 모든 상점에 대한 크롤링 실시 -> 순차적으로 접근, 병렬 실행 시 고쳐야될 부분이 많음 """
+from workbook import new_ranking_workbook, WorkbookWriter, ShardedWorkbookWriter
+from resilience import CrawlError, Cancelled, CancelToken, ShopTimeout, SHOP_TIME_BUDGET_SEC
+from snapshot import SnapshotArchive
+from perf_profile import RunProfiler
+from analytics import index_parts
+
+def run_all_sequential(window: sg.Window, shops: list[str], outdir: str, period: str, log_q: queue.Queue,
+                       cancel: CancelToken | None = None, snapshot: bool = False, tabs: int = 1,
+                       reuse_profile: bool = False, perf_profile: bool = False,
+                       shard_shops: int = 0, shard_mb: float = 0,
+                       time_budget: float = SHOP_TIME_BUDGET_SEC) -> None:
+    """
+    모든 상점에 대한 크롤링 실시 -> 순차적으로 접근, 병렬 실행 시 고쳐야될 부분이 많음
+    cancel 이 취소되면 진행 중인 브라우저를 바로 닫고, 그때까지 수집한 결과만 저장한다.
+    snapshot=True 이면 방문한 페이지 HTML/이미지를 outdir/snapshots 에 보관한다(snapshot.py replay 로 재처리).
+    tabs > 1 이면 한 브라우저에서 상품 상세 페이지를 tabs 개 탭으로 동시에 로드한다.
+    reuse_profile=True 이면 디스크 캐시가 유지되는 크롬 프로필을 재사용한다(profile_store.py).
+    perf_profile=True 이면 상점별 크롤링/시트 작성/저장 구간의 CPU 프로파일을 엑셀 옆에 남긴다(perf_profile.py).
+    shard_shops/shard_mb 중 하나라도 0보다 크면 상점 수/이미지 용량 기준으로 _partNN.xlsx 파일을 나눠
+    워커 프로세스에서 저장하고, 통합 파일 자리에는 상점 → 분할 파일 인덱스 워크북을 만든다.
+    time_budget: 상점 하나의 최대 시간(초). 넘으면 그때까지 수집한 행만 기록하고 다음 상점으로.
+    """
     try:
         ts = datetime.now().strftime("%Y-%m-%d_%H%M%S")
         combined_path = os.path.join(outdir, f"qoo10_top5_{ts}.xlsx")
         manager = CrawlerManager.get(save_path=outdir, period=period)
-
-        # 엑셀 워크 시트 준비하기
-        work_book = Workbook()
-        work_sheet: Worksheet = work_book.active
-        # 시트명
-        work_sheet.title = "ranking"
-        # 컬럼명 지정
-        headers_xlsx = ["Rank", "Name", "Price(JPY)", "Price(KRW)", "Reviews",
-                        "Product URL", "Shop", "Total Count", "Image"]
-        work_sheet.append(headers_xlsx)
-        header_fill = PatternFill("solid", fgColor="F3F6FA")
-        header_font = Font(bold=True, color="1F2937")
-        header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        thin = Side(style="thin", color="DDDDDD")
-        header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-        # 헤더 행 높이/프리즈/오토필터
-        work_sheet.row_dimensions[1].height = 22
-        work_sheet.freeze_panes = "A2"
-        work_sheet.auto_filter.ref = f"A1:I1"   # 범위는 데이터 추가 후 아래에서 다시 확장
-
-        # 헤더 각 셀 스타일 적용 & 기본 너비(가독성 위주)
-        pref_widths = [8, 40, 12, 12, 10, 50, 14, 12, 25]  # A..I
-        for col_idx, _ in enumerate(headers_xlsx, start=1):
-            cell = work_sheet.cell(row=1, column=col_idx)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_align
-            cell.border = header_border
-            col_letter = get_column_letter(col_idx)
-            work_sheet.column_dimensions[col_letter].width = pref_widths[col_idx-1]
+        cancel = cancel or CancelToken()
+        snapshots = SnapshotArchive(os.path.join(outdir, "snapshots"), run_id=ts) if snapshot else None
+        product_index = manager.start_run(cancel, snapshots)
+        manager.tabs = tabs
+        manager.time_budget = time_budget
+        manager.use_profiles(reuse_profile)
+
+        # 엑셀 워크 시트 준비하기 (헤더 스타일 포함)
+        # 시트 작성/저장은 전용 스레드에서 → 다음 상점 크롤링과 겹쳐서 진행
+        profiler = RunProfiler(combined_path, enabled=perf_profile)
+        if shard_shops > 0 or shard_mb > 0:
+            writer = ShardedWorkbookWriter(combined_path, max_shops=shard_shops, max_mb=shard_mb,
+                                           log=log_q.put, profiler=profiler, period=period).start()
+        else:
+            work_book, work_sheet = new_ranking_workbook()
+            writer = WorkbookWriter(work_book, work_sheet, log=log_q.put, profiler=profiler, period=period).start()
 
         for idx, shop in enumerate(shops):
+            if cancel.is_cancelled:
+                log_q.put(f"[CANCEL] 남은 {len(shops) - idx}개 상점 건너뜀")
+                break
             try:
                 log_q.put(f"[START] {shop} 수집 시작 (period={period})")
-                crawler = manager.run_shop(shop) 
-                # 워크 시트에 크롤링한 데이터 전달
-                _ = append_to_worksheet(work_sheet, crawler.results, crawler.images)
+                with profiler.section(f"crawl_{shop}") as commands:
+                    manager.command_stats = commands
+                    crawler = manager.run_shop(shop)
+                # 워크 시트 작성 스레드에 크롤링한 데이터 전달(대기열이 차 있으면 여기서 대기)
+                writer.submit(shop, crawler.results, crawler.images)
                 window.write_event_value("-STEP_DONE-", combined_path)
-                # work_book.save(combined_path)
-                log_q.put(f"[DONE] {shop} 완료")
+                log_q.put(crawler.detail_summary())
+                log_q.put(f"[DONE] {shop} 완료 (시트 작성 대기 {writer.pending}개)")
+            except Cancelled as e:
+                # 중지 시점까지 수집된 부분 결과도 기록
+                partial = manager.crawler
+                if partial is not None and partial.results:
+                    writer.submit(shop, partial.results, partial.images)
+                log_q.put(f"[CANCEL] {shop}: {e}")
+                log_q.put(f"[CANCEL] 남은 {len(shops) - idx - 1}개 상점 건너뜀")
+                break
+            except ShopTimeout as e:
+                # 느린 상점: 시간 예산 안에 수집한 행은 기록하고 다음 상점으로
+                partial = manager.crawler
+                rows = len(partial.results) if partial is not None else 0
+                if rows:
+                    writer.submit(shop, partial.results, partial.images)
+                log_q.put(f"[TIMEOUT] {shop}: {e} (수집된 {rows}행 기록)")
+            except CrawlError as e:
+                # 없는 상점/빈 랭킹/서킷 open: 스택 없이 한 줄로 남기고 다음 상점으로
+                log_q.put(f"[SKIP] {shop}: {e}")
             except Exception as e:
                 log_q.put("[ERROR] " + repr(e))
                 log_q.put(traceback.format_exc())
-                
-        # 모든 상점 처리 후 통합 파일 저장
-        try:
-            autosize_text_columns(work_sheet, skip_letters={"I"})
-            work_book.save(combined_path)
-            log_q.put(f"[SAVE] 결과 저장: {combined_path}")
-        except Exception as e:
-            log_q.put(f"[WARN] 파일 저장 실패: {e}")
+        log_q.put(product_index.summary())
+        if snapshots is not None:
+            log_q.put(snapshots.summary())
+        log_q.put(manager.load_stats.summary())
+
+        # 모든 상점 처리 후 통합 파일 저장 (남은 시트 작성이 끝나는 즉시 저장 시작)
+        log_q.put(f"[SAVE] 저장 대기 중 (시트 작성 대기 {writer.pending}개)")
+        if writer.finish(combined_path):
+            log_q.put(f"[SAVE] 결과 저장: {combined_path} (저장 {writer.save_sec:.1f}초, 최대 작성 지연 {writer.max_lag_sec:.1f}초)")
+        if profiler.enabled:
+            manager.command_stats = None
+            for line in profiler.summary_lines():
+                log_q.put(line)
+            log_q.put(f"[PERF] 프로파일 저장: {profiler.write_summary()}")
         window.write_event_value("-STEP_DONE-", combined_path)
         window.write_event_value("-ALL_DONE-", True)
     except Exception as e:
@@ -80,95 +104,6 @@ def run_all_sequential(window: sg.Window, shops: list[str], outdir: str, period:
         log_q.put(traceback.format_exc())
         window.write_event_value("-ALL_DONE-", True)
 
-def append_to_worksheet(work_sheet: Worksheet, data_results: list[ItemRow], images: list[Image]) -> int:
-    if not data_results:
-        return 0
-
-    img_col_letter = "I"
-    # 이미지 열 폭은 헤더 단계에서 지정되었다고 가정(없으면 기본 지정)
-    if not work_sheet.column_dimensions[img_col_letter].width:
-        work_sheet.column_dimensions[img_col_letter].width = 25
-    target_col_px = excel_col_width_to_pixels(work_sheet.column_dimensions[img_col_letter].width)
-
-    # ✅ 본문 공통 스타일
-    thin = Side(style="thin", color="EEEEEE")
-    body_border = Border(left=thin, right=thin, top=thin, bottom=thin)
-    align_left  = Alignment(horizontal="left",  vertical="center", wrap_text=True)
-    align_right = Alignment(horizontal="right", vertical="center")
-    align_center= Alignment(horizontal="center",vertical="center")
-
-    # 줄무늬(밴드) 색
-    band_fill = PatternFill("solid", fgColor="FAFAFA")
-    row_idx = work_sheet.max_row + 1
-    for i, r in enumerate(data_results, start=1):
-        # Rank
-        c = work_sheet.cell(row=row_idx, column=1, value=i)
-        c.alignment = align_center; c.border = body_border
-
-        # Name
-        c = work_sheet.cell(row=row_idx, column=2, value=r.name)
-        c.alignment = align_left; c.border = body_border
-
-        # Price(JPY)
-        c = work_sheet.cell(row=row_idx, column=3, value=r.price_jpy)
-        c.number_format = '#,##0'; c.alignment = align_right; c.border = body_border
-
-        # Price(KRW)
-        c = work_sheet.cell(row=row_idx, column=4, value=r.price_krw)
-        c.number_format = '#,##0'; c.alignment = align_right; c.border = body_border
-
-        # Reviews
-        c = work_sheet.cell(row=row_idx, column=5, value=r.review_count)
-        c.number_format = '#,##0'; c.alignment = align_center; c.border = body_border
-
-        # Product URL (하이퍼링크 + 파란 밑줄)
-        c = work_sheet.cell(row=row_idx, column=6, value=r.product_url)
-        c.hyperlink = r.product_url
-        c.style = "Hyperlink"
-        c.alignment = align_left
-        c.border = body_border
-
-        # Shop
-        c = work_sheet.cell(row=row_idx, column=7, value=r.shop_name)
-        c.alignment = align_left; c.border = body_border
-
-        # Total Count (문자면 그대로, 숫자면 포맷)
-        c = work_sheet.cell(row=row_idx, column=8, value=r.total_count)
-        try:
-            float(r.total_count)
-            c.number_format = '#,##0'
-            c.alignment = align_right
-        except Exception:
-            c.alignment = align_left
-        c.border = body_border
-
-        # ✅ 밴드 채우기(가독성) — 데이터 영역 전체 셀에 적용
-        if (row_idx % 2) == 0:
-            for col in range(1, 9):  # A..H (이미지 I 제외)
-                work_sheet.cell(row=row_idx, column=col).fill = band_fill
-
-        # 이미지(I열)
-        img_info = images[i-1]
-        xlimg = XLImage(io.BytesIO(img_info.img_bytes))
-        orig_w, orig_h = float(xlimg.width), float(xlimg.height)
-        scale = min(1.0, target_col_px / orig_w) if orig_w > 0 else 1.0
-        xlimg.width = orig_w * scale
-        xlimg.height = orig_h * scale
-
-        work_sheet.row_dimensions[row_idx].height = pixels_to_row_height_points(xlimg.height)
-        work_sheet.add_image(xlimg, f"{img_col_letter}{row_idx}")
-
-        # 이미지 셀도 테두리만
-        work_sheet.cell(row=row_idx, column=9).border = body_border
-        if (row_idx % 2) == 0:
-            work_sheet.cell(row=row_idx, column=9).fill = band_fill
-
-        row_idx += 1
-
-    # ✅ 데이터 추가 후 오토필터 범위 갱신
-    work_sheet.auto_filter.ref = f"A1:I{work_sheet.max_row}"
-    return len(data_results)
-
 def normalize_shop(line: str) -> str:
     line = line.strip()
     if not line:
@@ -185,6 +120,12 @@ def rows_from_one_file(path: str) -> list[list]:
         if not path:
             return []
         df = pd.read_excel(path)
+        if "File" in df.columns:
+            # 분할 저장의 인덱스 파일 → 분할 파일 ranking 시트를 이어서 읽음(없는 분할 파일은 경고)
+            parts = index_parts(path, df)
+            if not parts:
+                return []
+            df = pd.concat([pd.read_excel(p, sheet_name="ranking") for p in parts], ignore_index=True)
 
         # 목표 테이블 헤더 순서
         targets = ["Shop", "Name", "JPY", "KRW", "Reviews", "URL"]
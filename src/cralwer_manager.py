@@ -1,5 +1,10 @@
 from crawler import Crawler
 from utils import ensure_dir
+from product_index import ProductIndex
+from resilience import CircuitBreaker, CancelToken, SHOP_TIME_BUDGET_SEC
+from snapshot import SnapshotArchive
+from profile_store import ProfilePool, LoadStats, DEFAULT_PROFILE_ROOT
+from perf_profile import CommandStats
 import threading
 
 class CrawlerManager:
@@ -10,6 +15,15 @@ class CrawlerManager:
         self.save_path = save_path
         self.period = period
         self._crawler = None  # 단일 Crawler 인스턴스
+        self.product_index = ProductIndex()  # 상점 간 공유하는 상품 중복 제거 인덱스
+        self.breaker = CircuitBreaker()      # 상점 간 공유하는 실패율 서킷 브레이커
+        self.cancel = CancelToken()          # 실행 단위 중지 토큰
+        self.snapshots: SnapshotArchive | None = None  # 원본 HTML 스냅샷 보관소(옵션)
+        self.tabs = 1                        # 상품 상세 페이지 동시 탭 수
+        self.profile_pool: ProfilePool | None = None  # 재사용 크롬 프로필(실행 간 유지)
+        self.load_stats = LoadStats()        # cold/warm 첫 페이지 로드 시간
+        self.command_stats: CommandStats | None = None  # 성능 프로파일 모드: 현재 상점의 WebDriver 명령 통계
+        self.time_budget = SHOP_TIME_BUDGET_SEC  # 상점 하나에 쓸 수 있는 최대 시간(초)
 
     @classmethod
     def get(cls, save_path: str, period: str) -> "CrawlerManager":
@@ -22,6 +36,25 @@ class CrawlerManager:
                 cls._instance.period = period
             return cls._instance
 
+    def start_run(self, cancel: CancelToken | None = None,
+                  snapshots: SnapshotArchive | None = None) -> ProductIndex:
+        """ 새 실행 시작: 이전 실행의 상품 인덱스/브레이커 상태를 버리고 새로 만든다 """
+        self.product_index = ProductIndex()
+        self.breaker = CircuitBreaker()
+        self.cancel = cancel or CancelToken()
+        self.snapshots = snapshots
+        self.load_stats = LoadStats()
+        return self.product_index
+
+    def use_profiles(self, enabled: bool, root: str | None = None) -> None:
+        """ 재사용 크롬 프로필 사용 여부. 프로필 풀은 실행이 바뀌어도 유지된다 """
+        self.profile_pool = ProfilePool(root or DEFAULT_PROFILE_ROOT) if enabled else None
+
+    @property
+    def crawler(self) -> Crawler | None:
+        """ 마지막으로 실행한 Crawler (중지/실패 시 부분 결과 확인용) """
+        return self._crawler
+
     def run_shop(self, shop_name: str) -> Crawler:
         """
         단일 Crawler 인스턴스를 재사용하되,
@@ -42,5 +75,16 @@ class CrawlerManager:
             if hasattr(self._crawler, "save_root"):
                 self._crawler.save_root = self.save_path
 
-        self._crawler.run()
+        self._crawler.product_index = self.product_index
+        self._crawler.breaker = self.breaker
+        self._crawler.cancel = self.cancel
+        self._crawler.snapshots = self.snapshots
+        self._crawler.tabs = max(1, self.tabs)
+        self._crawler.profile_pool = self.profile_pool
+        self._crawler.command_stats = self.command_stats
+        self._crawler.time_budget = self.time_budget
+        try:
+            self._crawler.run()
+        finally:
+            self.load_stats.add(self._crawler.session_kind, self._crawler.first_load_sec)
         return self._crawler
\ No newline at end of file
@@ -3,8 +3,15 @@ from __future__ import annotations
 
 import os
 import io
+import time
+import signal
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -12,20 +19,80 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from item import ItemRow
+from item import ItemRow, JPY_TO_KRW
 from image import Image
+from product_index import ProductIndex, ProductDetail
+from snapshot import SnapshotArchive
+from profile_store import ProfilePool, ChromeProfile, is_profile_error
+from perf_profile import CommandStats
+from resilience import (Deadline, CircuitBreaker, CancelToken, Cancelled, ShopNotFound, EmptyRanking,
+                        retry_call, PERMANENT_ERRORS, SHOP_TIME_BUDGET_SEC)
 from utils import *
 from openpyxl import Workbook
 from openpyxl.drawing.image import Image as XLImage
 
 
 BASE_URL = "https://m.qoo10.jp/shop/"
-JPY_TO_KRW = 9.40
 VALID_PERIODS = {"D": "日", "W": "週", "M": "月"}
+# 상점 페이지 판별 대기(초): 이 시간 안에 랭킹 영역이 안 보이면 없는/닫힌 상점으로 간주
+SHOP_PROBE_SEC = 8
+PAGE_LOAD_TIMEOUT_SEC = 30
+# 중지 요청 시 driver.quit() 을 기다리는 최대 시간(초), 넘으면 chromedriver + Chrome 프로세스 트리 강제 종료
+DRIVER_QUIT_TIMEOUT_SEC = 5
+# 탭 모드: 탭 하나가 상품 페이지를 기다리는 최대 시간 / 이미지 확인 후 리뷰를 기다리는 시간(초)
+TAB_LOAD_TIMEOUT_SEC = 15
+TAB_REVIEW_GRACE_SEC = 2
+TAB_POLL_SEC = 0.05
+
+@dataclass
+class _TabLoad:
+    """ 탭 하나에서 진행 중인 상품 페이지 로드 상태 """
+    url: str
+    started: float = field(default_factory=time.monotonic)
+    img_seen: Optional[float] = None
+
+def browser_memory_mb(driver) -> Optional[float]:
+    """ chromedriver + Chrome 프로세스 트리 RSS 합계(MB). psutil 이 없거나 측정 불가면 None """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+    except Exception:
+        return None
+
+def kill_process_tree(pid: int) -> None:
+    """ chromedriver 와 그 아래 Chrome 브라우저/렌더러 프로세스까지 강제 종료 """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            # 부모를 먼저 죽이면 자식이 다른 부모로 넘어가므로 목록부터 확보
+            procs = root.children(recursive=True) + [root]
+        except psutil.Error:
+            return
+        for p in procs:
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(procs, timeout=3)
+    elif os.name == "nt":
+        subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True)
+    else:
+        os.kill(pid, signal.SIGKILL)
 
 class Crawler:
-    def __init__(self, shop_name: str, save_path: str = "./results", period: str = "W"):
+    def __init__(self, shop_name: str, save_path: str = "./results", period: str = "W",
+                 time_budget: float = SHOP_TIME_BUDGET_SEC):
         self.shop_name:     str = shop_name
         self.period:        str = period.upper()
         if self.period not in VALID_PERIODS:
@@ -35,6 +102,30 @@ class Crawler:
         self._snap:         List[Dict[str, Any]] = []
         # {"idx" : 검색된 이미지 인덱스(일종의 순서), "bytes" : 실제 이미지 데이터, "ext" : 파일 형식}
         self.images:       List[Image] = []  
+        # 실행 단위 상품 중복 제거 인덱스(CrawlerManager 가 상점 간에 공유하도록 교체)
+        self.product_index: ProductIndex = ProductIndex()
+        # 상점 단위 시간 예산 / 실패율 서킷 브레이커(브레이커는 CrawlerManager 가 상점 간 공유)
+        self.time_budget:   float = time_budget
+        self.deadline:      Deadline = Deadline(time_budget)
+        self.breaker:       CircuitBreaker = CircuitBreaker()
+        # 중지 버튼 → 취소 토큰(CrawlerManager 가 실행 단위로 주입)
+        self.cancel:        CancelToken = CancelToken()
+        self.driver = None
+        # 원본 HTML 스냅샷 보관소(옵션, None 이면 보관하지 않음)
+        self.snapshots:     Optional[SnapshotArchive] = None
+        # 상품 상세 페이지를 동시에 여는 탭 수(1 이면 기존처럼 한 페이지씩)
+        self.tabs:          int = 1
+        # 상세 단계 처리량 지표(run 마다 갱신): pages, seconds, tabs, memory_mb
+        self.detail_stats:  Dict[str, Any] = {}
+        self._tabs_memory_mb: Optional[float] = None
+        # 재사용 크롬 프로필 풀(옵션, None 이면 매번 임시 프로필)
+        self.profile_pool:  Optional[ProfilePool] = None
+        self.profile:       Optional[ChromeProfile] = None
+        # 세션 첫 페이지 로드 시간과 프로필 상태("cold"/"warm") — 실행 지표용
+        self.session_kind:  str = "cold"
+        self.first_load_sec: Optional[float] = None
+        # 옵션: WebDriver 명령 통계(성능 프로파일 모드에서 주입)
+        self.command_stats: Optional[CommandStats] = None
 
     def setup_driver(self):
         """ chrom driver 설정 함수 """
@@ -64,41 +155,81 @@ class Crawler:
         options.add_argument('--blink-settings=imagesEnabled=false')
         # 모바일 설정
         options.add_experimental_option("mobileEmulation", {"deviceName": "Galaxy S8"})
+        # 재사용 프로필: JS/CSS/폰트를 디스크 캐시에서 바로 읽어 첫 페이지 로드가 빨라짐
+        if self.profile is not None:
+            for arg in self.profile.chrome_args():
+                options.add_argument(arg)
         self.driver = webdriver.Chrome(
             service=ChromeService(ChromeDriverManager().install()),
             options=options
         )
+        if self.command_stats is not None:
+            self.command_stats.instrument(self.driver)
 
         self.wait = WebDriverWait(self.driver, 10)
         KST = timezone(timedelta(hours=9))
         self.search_datetime = datetime.now(KST).strftime("%Y-%m-%d_%H%M%S")
         print(f"[INIT] WebDriver ready at {self.search_datetime}")
 
+    def _wait(self, timeout: float = 10) -> WebDriverWait:
+        """ 남은 시간 예산을 넘지 않는 WebDriverWait """
+        return WebDriverWait(self.driver, self.deadline.cap(timeout))
+
+    def _get(self, url: str, stage: str):
+        """ 시간 예산 안에서 페이지 이동 (일시적 오류는 지터 재시도, 결과는 브레이커에 기록) """
+        def _load():
+            self.cancel.check()
+            self.deadline.check(stage)
+            self.driver.set_page_load_timeout(self.deadline.cap(PAGE_LOAD_TIMEOUT_SEC))
+            started = time.monotonic()
+            self.driver.get(url)
+            if self.first_load_sec is None:
+                self.first_load_sec = time.monotonic() - started
+        retry_call(_load, deadline=self.deadline, breaker=self.breaker, cancel=self.cancel)
+
+    def open_shop(self):
+        """ 상점 페이지 진입 + 없는/닫힌 상점 빠른 판별 """
+        self._get(f"{BASE_URL}/{self.shop_name}", "open shop")
+        try:
+            self._wait(SHOP_PROBE_SEC).until(EC.any_of(
+                EC.presence_of_element_located((By.ID, "ul_ranking_period")),
+                EC.presence_of_element_located((By.ID, "ul_minishop_ranking")),
+            ))
+        except TimeoutException:
+            raise ShopNotFound(f"{self.shop_name}: ranking area not found ({self.driver.current_url})")
+
     def select_period(self):
-        self.wait.until(EC.presence_of_element_located((By.ID, "ul_ranking_period")))
-        old_list = self.wait.until(EC.presence_of_element_located((By.ID, "ul_minishop_ranking")))
+        self._wait().until(EC.presence_of_element_located((By.ID, "ul_ranking_period")))
+        old_list = self._wait().until(EC.presence_of_element_located((By.ID, "ul_minishop_ranking")))
         btn_sel = f'#ul_ranking_period button[value="{self.period}"]'
-        btn = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, btn_sel)))
+        btn = self._wait().until(EC.element_to_be_clickable((By.CSS_SELECTOR, btn_sel)))
         self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
         try:
             btn.click()
         except Exception:
             self.driver.execute_script("arguments[0].click();", btn)
         try:
-            WebDriverWait(self.driver, 10).until(EC.staleness_of(old_list))
+            # 목록 교체(staleness)는 보통 바로 일어나므로 짧게 기다리고, 안 되면 선택 상태로 확인
+            self._wait(5).until(EC.staleness_of(old_list))
         except Exception:
-            self.wait.until(EC.presence_of_element_located(
+            self._wait().until(EC.presence_of_element_located(
                 (By.CSS_SELECTOR, f'#ul_ranking_period li.selected button[value="{self.period}"]')
             ))
-        self.wait.until(EC.presence_of_element_located((By.ID, "ul_minishop_ranking")))
+        self._wait().until(EC.presence_of_element_located((By.ID, "ul_minishop_ranking")))
         print(f"[PERIOD] switched to {self.period} ({VALID_PERIODS[self.period]})")
 
     def collect_items(self):
-        self.driver.get(f"{BASE_URL}/{self.shop_name}")
+        self.detail_stats = {}
+        self.open_shop()
         self.select_period()
-        self.wait.until(EC.presence_of_element_located((By.ID, "ul_minishop_ranking")))
+        self._wait().until(EC.presence_of_element_located((By.ID, "ul_minishop_ranking")))
         lis_sel = "ul#ul_minishop_ranking > li"
         lis = self.driver.find_elements(By.CSS_SELECTOR, lis_sel)
+        if not lis:
+            raise EmptyRanking(f"{self.shop_name}: empty ranking for period {self.period}")
+        if self.snapshots is not None:
+            self.snapshots.put_page("ranking", self.driver.current_url, self.driver.page_source,
+                                    shop=self.shop_name, period=self.period)
         count = min(len(lis), 10)
 
         for i in range(count):
@@ -117,42 +248,220 @@ class Crawler:
                 "total_count": total_count
             })
 
-        for row in self._snap:
-            self.driver.get(row["product_url"])
+        detail_started = time.monotonic()
+        pages = 0
+        # 탭 모드: 아직 본 적 없는 상품을 여러 탭에서 한꺼번에 로드
+        prefetched: Dict[str, ProductDetail] = {}
+        if self.tabs > 1:
+            todo: Dict[str, str] = {}
+            for row in self._snap:
+                code = canonical_goods_code(row["product_url"])
+                if code and code not in self.product_index and code not in todo:
+                    todo[code] = row["product_url"]
             try:
-                review_txt = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "p.reviewstar_text"))
-                ).text
-            except Exception:
-                review_txt = "0"
-            review_cnt = only_digits(review_txt)
+                by_url = self.fetch_details_tabs(list(todo.values()))
+            except PERMANENT_ERRORS:
+                raise
+            except Exception as e:
+                # 탭 모드가 실패하면 한 페이지씩 방문하는 기존 방식으로 계속
+                print(f"[WARN] 탭 모드 실패, 순차 방문으로 전환: {e!r}")
+                by_url = {}
+            prefetched = {code: by_url[url] for code, url in todo.items() if url in by_url}
+            pages += len(prefetched)
 
-            img_el = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "button.imgLink img"))
-            )
-            image_url = img_el.get_attribute("src")
-            img_bytes = fetch_image_bytes(image_url)
-            ext = guess_ext_from_url(image_url)
+        for row in self._snap:
+            # 같은 상품(goods code)은 실행 중 한 번만 상세 페이지/이미지를 가져옴
+            goods_code = canonical_goods_code(row["product_url"])
+            detail = self.product_index.get(goods_code)
+            self.cancel.check()
+            if detail is None:
+                detail = prefetched.get(goods_code)
+                if detail is None:
+                    self.deadline.check(f"detail #{row['idx']}")
+                    detail = self.fetch_detail(row["product_url"])
+                    pages += 1
+                self.product_index.put(goods_code, detail)
 
             # 디스크에 이미지 저장하지 않음(메모리 전용)
             self.results.append(ItemRow(
                 name=row["name"],
                 price_jpy=row["price_jpy"],
                 price_krw=row["price_krw"],
-                review_count=review_cnt,
-                image_url=image_url,
+                review_count=detail.review_count,
+                image_url=detail.image_url,
                 image_path="",  # 저장하지 않으므로 빈 문자열
                 product_url=row["product_url"],
                 shop_name=self.shop_name,
-                total_count=row["total_count"]
+                total_count=row["total_count"],
+                goods_code=goods_code
             ))
             self.images.append(
                 Image(
                     idx=row["idx"],
-                    img_bytes= img_bytes,
-                    ext=ext
+                    img_bytes=detail.img_bytes,
+                    ext=detail.ext
                 ))
 
+        self.detail_stats = {
+            "pages": pages,
+            "seconds": time.monotonic() - detail_started,
+            "tabs": self.tabs,
+            # 탭 모드는 탭을 모두 연 상태에서 잰 값
+            "memory_mb": self._tabs_memory_mb if self.tabs > 1 else browser_memory_mb(self.driver),
+        }
+        print(self.detail_summary())
+
+    def detail_summary(self) -> str:
+        """ 상세 단계 처리량: 분당 페이지 수, 브라우저 메모리 GB 당 분당 페이지 수(탭 모드 vs 1탭 비교용) """
+        s = self.detail_stats
+        if not s or not s["pages"]:
+            return f"[DETAIL] {self.shop_name}: 새로 방문한 상품 페이지 없음"
+        per_min = s["pages"] / max(s["seconds"], 1e-6) * 60
+        text = f"[DETAIL] {self.shop_name}: 탭 {s['tabs']}개, 상품 {s['pages']}개 / {s['seconds']:.1f}초 → {per_min:.1f}개/분"
+        if s["memory_mb"]:
+            text += f", 브라우저 {s['memory_mb']:.0f}MB → {per_min / (s['memory_mb'] / 1024):.1f}개/분/GB"
+        return text
+
+    def fetch_detail(self, product_url: str) -> ProductDetail:
+        """ 상품 상세 페이지 방문 → 리뷰 수, 대표 이미지 (이미지가 없으면 빈 이미지) """
+        self._get(product_url, "detail page")
+        try:
+            img_el = self._wait().until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "button.imgLink img"))
+            )
+            image_url = img_el.get_attribute("src") or ""
+        except TimeoutException:
+            print(f"[WARN] 대표 이미지 없음: {product_url}")
+            image_url = ""
+        # 이미지 영역까지 로드된 뒤라 리뷰 영역은 짧게만 기다림(리뷰 없는 상품이 많음)
+        try:
+            review_txt = self._wait(2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "p.reviewstar_text"))
+            ).text
+        except Exception:
+            review_txt = "0"
+        review_cnt = only_digits(review_txt)
+        if self.snapshots is not None:
+            self.snapshots.put_page("product", product_url, self.driver.page_source,
+                                    goods_code=canonical_goods_code(product_url))
+
+        img_bytes = self._download_image(image_url) if image_url else b""
+        return ProductDetail(
+            review_count=review_cnt,
+            image_url=image_url,
+            img_bytes=img_bytes,
+            ext=guess_ext_from_url(image_url)
+        )
+
+    def fetch_details_tabs(self, urls: List[str]) -> Dict[str, ProductDetail]:
+        """
+        한 브라우저 세션에서 self.tabs 개 탭으로 상품 상세 페이지를 동시에 로드한다.
+        각 탭에 이동 명령만 보내고(비동기), 준비된 탭부터 리뷰/이미지 URL을 수확.
+        이미지 다운로드는 스레드 풀에서 병렬 처리. 시간 안에 못 끝낸 URL 은 결과에서 빠지며
+        호출한 쪽에서 fetch_detail 로 다시 시도한다.
+        """
+        self._tabs_memory_mb = None
+        if not urls:
+            return {}
+        main = self.driver.current_window_handle
+        handles = [main]
+        for _ in range(min(self.tabs, len(urls)) - 1):
+            self.driver.switch_to.new_window("tab")
+            handles.append(self.driver.current_window_handle)
+
+        pending = deque(urls)
+        inflight: Dict[str, _TabLoad] = {}
+        harvested: Dict[str, tuple[int, str]] = {}
+        futures: Dict[str, Future] = {}
+        pool = ThreadPoolExecutor(max_workers=len(handles), thread_name_prefix="img")
+        try:
+            while pending or inflight:
+                self.cancel.check()
+                self.deadline.check("detail tabs")
+                # 1) 빈 탭에 이동 명령 발사 — 이전 문서에 표시를 남겨 새 문서와 구분
+                for h in handles:
+                    if h not in inflight and pending:
+                        url = pending.popleft()
+                        self.driver.switch_to.window(h)
+                        self.driver.execute_script("window.__qoo10_stale = true; location.href = arguments[0];", url)
+                        inflight[h] = _TabLoad(url)
+                # 2) 준비된 탭부터 수확
+                progressed = False
+                for h, load in list(inflight.items()):
+                    self.driver.switch_to.window(h)
+                    out = self._harvest_tab(load)
+                    if out is None:
+                        continue
+                    del inflight[h]
+                    progressed = True
+                    if out is False:
+                        print(f"[WARN] 탭 로드 시간 초과: {load.url}")
+                        continue
+                    review_cnt, image_url = out
+                    harvested[load.url] = out
+                    if self.snapshots is not None:
+                        self.snapshots.put_page("product", load.url, self.driver.page_source,
+                                                goods_code=canonical_goods_code(load.url))
+                    if image_url:
+                        futures[load.url] = pool.submit(self._download_image, image_url)
+                if not progressed:
+                    time.sleep(TAB_POLL_SEC)
+            self._tabs_memory_mb = browser_memory_mb(self.driver)
+
+            details: Dict[str, ProductDetail] = {}
+            for url, (review_cnt, image_url) in harvested.items():
+                img_bytes = futures[url].result() if url in futures else b""
+                details[url] = ProductDetail(
+                    review_count=review_cnt,
+                    image_url=image_url,
+                    img_bytes=img_bytes,
+                    ext=guess_ext_from_url(image_url)
+                )
+            return details
+        finally:
+            pool.shutdown(wait=not self.cancel.is_cancelled, cancel_futures=True)
+            # 추가로 연 탭 정리 (중지로 드라이버가 닫혔으면 무시)
+            try:
+                for h in handles[1:]:
+                    self.driver.switch_to.window(h)
+                    self.driver.close()
+                self.driver.switch_to.window(main)
+            except Exception:
+                pass
+
+    def _harvest_tab(self, load: _TabLoad):
+        """
+        현재 탭의 상태 확인(블로킹 없음).
+        아직 로딩 중이면 None, 시간 초과면 False, 준비됐으면 (리뷰 수, 이미지 URL)
+        """
+        now = time.monotonic()
+        timed_out = now - load.started > TAB_LOAD_TIMEOUT_SEC
+        state = self.driver.execute_script("return window.__qoo10_stale === true ? null : document.readyState;")
+        if state is None or state == "loading":
+            return False if timed_out else None
+        imgs = self.driver.find_elements(By.CSS_SELECTOR, "button.imgLink img")
+        image_url = (imgs[0].get_attribute("src") or "") if imgs else ""
+        if not image_url:
+            if not timed_out:
+                return None
+            print(f"[WARN] 대표 이미지 없음: {load.url}")
+        elif load.img_seen is None:
+            load.img_seen = now
+        reviews = self.driver.find_elements(By.CSS_SELECTOR, "p.reviewstar_text")
+        if not reviews and load.img_seen is not None and now - load.img_seen < TAB_REVIEW_GRACE_SEC:
+            return None
+        review_cnt = only_digits(reviews[0].text) if reviews else 0
+        return review_cnt, image_url
+
+    def _download_image(self, image_url: str) -> bytes:
+        img_bytes = retry_call(
+            lambda: fetch_image_bytes(image_url, timeout=self.deadline.cap(15), cancel=self.cancel),
+            deadline=self.deadline, breaker=self.breaker, cancel=self.cancel
+        )
+        if self.snapshots is not None:
+            self.snapshots.record("image", image_url, img_bytes)
+        return img_bytes
+
     def save_outputs(self) -> str:
         if not self.results:
             print("[INFO] 저장할 결과가 없습니다.")
@@ -200,16 +509,80 @@ class Crawler:
         print(f"[SAVE] XLSX(이미지 포함) 저장 완료: {xlsx_path}")
         return xlsx_path
 
+    def abort_driver(self):
+        """
+        중지 요청 시 호출(취소 토큰 콜백). 진행 중인 페이지 로드는 quit 으로 끊기고,
+        quit 이 DRIVER_QUIT_TIMEOUT_SEC 안에 끝나지 않으면 chromedriver 와 Chrome 프로세스 트리를 강제 종료한다.
+        """
+        driver = self.driver
+        if driver is None:
+            return
+        t = threading.Thread(target=driver.quit, daemon=True)
+        t.start()
+        t.join(DRIVER_QUIT_TIMEOUT_SEC)
+        if t.is_alive():
+            try:
+                kill_process_tree(driver.service.process.pid)
+            except Exception:
+                pass
+        print("[CANCEL] WebDriver 종료")
+
+    def start_browser(self):
+        """
+        프로필 슬롯을 잡고 드라이버 시작. 크롬이 안 뜨면 한 번 더 시도하되,
+        프로필이 깨졌거나 프로필 관련 오류일 때만 초기화한다(그 외 오류로 디스크 캐시를 지우지 않음).
+        """
+        self.profile = self.profile_pool.acquire() if self.profile_pool is not None else None
+        self.session_kind = "warm" if self.profile is not None and self.profile.is_warm else "cold"
+        try:
+            self.setup_driver()
+        except Exception as e:
+            if self.profile is None:
+                raise
+            if self.profile.is_corrupted() or is_profile_error(e):
+                self.profile.reset(f"chrome failed to start: {e.__class__.__name__}")
+                self.session_kind = "cold"
+            else:
+                # 드라이버 다운로드/네트워크/버전 불일치 등 → 프로필은 그대로 두고 재시도
+                print(f"[PROFILE] 크롬 시작 실패, 프로필 유지하고 재시도: {e.__class__.__name__}")
+            self.setup_driver()
+        print(f"[PROFILE] {self.session_kind} start" + (f" ({self.profile.path})" if self.profile else ""))
+
     @timer
     def run(self):
+        self.cancel.check()
+        # 최근 실패율이 높으면 남은 cooldown 동안 쉬었다가 half-open 시험 요청으로 재개(상점을 건너뛰지 않음)
+        left = self.breaker.cooldown_left()
+        if left > 0:
+            print(f"[CIRCUIT] 실패율 높음 → {left:.0f}초 대기 후 {self.shop_name} 재개")
+            self.breaker.wait_cooldown(self.cancel)
+        self.deadline = Deadline(self.time_budget)
+        self.first_load_sec = None
+        remove_cb = lambda: None
         try:
-            self.setup_driver()
+            self.start_browser()
+            # 시간 예산은 브라우저가 뜬 뒤부터(드라이버 설치/크롬 기동 시간은 제외)
+            self.deadline = Deadline(self.time_budget)
+            remove_cb = self.cancel.on_cancel(self.abort_driver)
             self.collect_items()
+        except Cancelled:
+            raise
+        except Exception as e:
+            # 중지로 드라이버가 닫히면서 난 오류는 취소로 정리
+            if self.cancel.is_cancelled:
+                raise Cancelled(f"{self.shop_name}: cancelled ({len(self.results)} rows collected)") from e
+            raise
         finally:
+            remove_cb()
             try:
-                self.driver.quit()
+                if self.driver is not None:
+                    self.driver.quit()
             except Exception:
                 pass
+            self.driver = None
+            if self.profile is not None:
+                self.profile.release()
+                self.profile = None
         # 테스트 시 주석을 해제하고 제대로 저장되는지 확인
         # self.save_outputs()
 
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 
+# 엔화 → 원화 환산 비율 (수집/스냅샷 재처리 공통)
+JPY_TO_KRW = 9.40
+
 @dataclass
 class ItemRow:
     shop_name: str
@@ -10,4 +13,5 @@ class ItemRow:
     image_url: str
     image_path: str
     product_url: str
-    total_count: str
\ No newline at end of file
+    total_count: str
+    goods_code: str = ""  # 정규화된 상품 코드(canonical_goods_code)
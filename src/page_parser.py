@@ -0,0 +1,198 @@
+""" 저장된 HTML 스냅샷에서 ItemRow 필드를 추출하는 오프라인 파서 (브라우저/네트워크 불필요) """
+from __future__ import annotations
+
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+from utils import only_digits
+from item import JPY_TO_KRW
+
+# 끝 태그가 없는 요소
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# 화면에 보이지 않는 텍스트
+HIDDEN_TAGS = {"script", "style", "noscript", "template", "head"}
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Node"]):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List["Node | str"] = []
+        self.parent = parent
+
+    @property
+    def classes(self) -> set[str]:
+        return set(self.attrs.get("class", "").split())
+
+    def get(self, attr: str) -> str:
+        return self.attrs.get(attr, "") or ""
+
+    def iter(self):
+        """ 문서 순서대로 하위 요소 순회(자기 자신 제외) """
+        for ch in self.children:
+            if isinstance(ch, Node):
+                yield ch
+                yield from ch.iter()
+
+    @property
+    def text(self) -> str:
+        """ WebElement.text 와 비슷하게 보이는 텍스트만 공백 정리해서 반환 """
+        parts: List[str] = []
+        def walk(n: Node):
+            if n.tag in HIDDEN_TAGS:
+                return
+            for ch in n.children:
+                if isinstance(ch, Node):
+                    walk(ch)
+                else:
+                    parts.append(ch)
+        walk(self)
+        return " ".join("".join(parts).split())
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {}, None)
+        self.cur = self.root
+
+    def handle_starttag(self, tag, attrs):
+        # 닫히지 않은 <li>/<p> 는 형제 요소가 시작되면 암묵적으로 닫힘
+        if tag in ("li", "p"):
+            n = self.cur
+            while n is not self.root and n.tag not in ("ul", "ol", "div"):
+                if n.tag == tag:
+                    self.cur = n.parent
+                    break
+                n = n.parent
+        node = Node(tag, {k: (v or "") for k, v in attrs}, self.cur)
+        self.cur.children.append(node)
+        if tag not in VOID_TAGS:
+            self.cur = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {k: (v or "") for k, v in attrs}, self.cur)
+        self.cur.children.append(node)
+
+    def handle_endtag(self, tag):
+        n = self.cur
+        while n is not self.root:
+            if n.tag == tag:
+                self.cur = n.parent
+                return
+            n = n.parent
+        # 짝이 없는 끝 태그는 무시
+
+    def handle_data(self, data):
+        self.cur.children.append(data)
+
+def parse_html(html: str) -> Node:
+    b = _TreeBuilder()
+    b.feed(html)
+    b.close()
+    return b.root
+
+# ---------- 간단 CSS 셀렉터 (tag, #id, .class, [attr], [attr=val], 자손 ' ', 자식 '>') ----------
+_COMPOUND_RE = re.compile(r"""([a-zA-Z][\w-]*|\*)?((?:[#.][\w-]+|\[[\w-]+(?:=["']?[^\]"']*["']?)?\])*)""")
+_PART_RE = re.compile(r"""#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=["']?([^\]"']*)["']?)?\]""")
+
+def _parse_compound(s: str):
+    m = _COMPOUND_RE.fullmatch(s)
+    if not m:
+        raise ValueError(f"unsupported selector: {s!r}")
+    tag = (m.group(1) or "*").lower()
+    ids, classes, attrs = [], [], []
+    for pm in _PART_RE.finditer(m.group(2) or ""):
+        if pm.group(1):
+            ids.append(pm.group(1))
+        elif pm.group(2):
+            classes.append(pm.group(2))
+        else:
+            attrs.append((pm.group(3), pm.group(4)))
+    return tag, ids, classes, attrs
+
+def _parse_selector(sel: str):
+    """ 'ul#a > li p.b' → [(' ', ul#a), ('>', li), (' ', p.b)] (앞 요소와의 결합자, 단순 셀렉터) """
+    steps, comb = [], " "
+    for t in sel.replace(">", " > ").split():
+        if t == ">":
+            comb = ">"
+            continue
+        steps.append((comb, _parse_compound(t)))
+        comb = " "
+    return steps
+
+def _match_compound(n: Node, comp) -> bool:
+    tag, ids, classes, attrs = comp
+    if tag != "*" and n.tag != tag:
+        return False
+    if any(n.attrs.get("id") != i for i in ids):
+        return False
+    if classes and not set(classes) <= n.classes:
+        return False
+    for name, val in attrs:
+        if name not in n.attrs or (val is not None and n.attrs[name] != val):
+            return False
+    return True
+
+def _match(n: Node, steps, i: int) -> bool:
+    comb, comp = steps[i]
+    if not _match_compound(n, comp):
+        return False
+    if i == 0:
+        return True
+    p = n.parent
+    if comb == ">":
+        return p is not None and p.tag != "#document" and _match(p, steps, i - 1)
+    while p is not None and p.tag != "#document":
+        if _match(p, steps, i - 1):
+            return True
+        p = p.parent
+    return False
+
+def select(root: Node, sel: str) -> List[Node]:
+    steps = _parse_selector(sel)
+    last = len(steps) - 1
+    return [n for n in root.iter() if _match(n, steps, last)]
+
+def select_one(root: Node, sel: str) -> Optional[Node]:
+    found = select(root, sel)
+    return found[0] if found else None
+
+def _text(parent: Node, sel: str) -> str:
+    n = select_one(parent, sel)
+    return n.text.strip() if n is not None else ""
+
+def _attr(parent: Node, sel: str, attr: str, base_url: str = "") -> str:
+    n = select_one(parent, sel)
+    if n is None:
+        return ""
+    v = n.get(attr)
+    # WebElement.get_attribute("href"/"src") 처럼 절대 URL 로 변환
+    return urljoin(base_url, v) if v and base_url and attr in ("href", "src") else v
+
+# ---------- Qoo10 페이지 파서 (Crawler.collect_items / fetch_detail 과 같은 셀렉터) ----------
+def parse_ranking(html: str, page_url: str = "", limit: int = 10) -> List[Dict[str, Any]]:
+    """ 미니샵 랭킹 페이지 → Crawler._snap 과 같은 형태의 dict 목록 """
+    root = parse_html(html)
+    out = []
+    for i, li in enumerate(select(root, "ul#ul_minishop_ranking > li")[:limit]):
+        price_jpy = only_digits(_text(li, "strong.price_original"))
+        out.append({
+            "idx": i,
+            "name": _text(li, "p.text_item"),
+            "price_jpy": price_jpy,
+            "price_krw": round(price_jpy * JPY_TO_KRW, 2),
+            "product_url": _attr(li, "div.top_wrap a", "href", page_url),
+            "total_count": _text(li, "span.option_text"),
+        })
+    return out
+
+def parse_product(html: str, page_url: str = "") -> tuple[int, str]:
+    """ 상품 상세 페이지 → (리뷰 수, 대표 이미지 URL) """
+    root = parse_html(html)
+    review_txt = _text(root, "p.reviewstar_text") or "0"
+    image_url = _attr(root, "button.imgLink img", "src", page_url)
+    return only_digits(review_txt), image_url
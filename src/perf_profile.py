@@ -0,0 +1,167 @@
+""" 옵션: 상점별 크롤링/시트 작성/저장 구간 CPU 프로파일 + WebDriver 명령 통계 """
+from __future__ import annotations
+
+import os
+import re
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterator, List, Optional
+
+from utils import ensure_dir
+
+# 3.12 부터 cProfile 은 스레드 단위가 아니라 인터프리터 전체(모든 스레드)를 기록하고, 동시에 하나만 켤 수 있다
+PER_THREAD_PROFILE = sys.version_info < (3, 12)
+
+class CommandStats:
+    """ WebDriver 명령별 호출 수/원격 대기 시간 """
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record(self, command: str, seconds: float) -> None:
+        with self._lock:
+            self.counts[command] += 1
+            self.seconds[command] += seconds
+
+    @property
+    def total_count(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def total_sec(self) -> float:
+        return sum(self.seconds.values())
+
+    def instrument(self, driver) -> None:
+        """
+        driver.execute 를 감싸서 모든 WebDriver 명령(get, findElement, executeScript ...)의
+        호출 수와 원격 응답을 기다린 시간을 기록한다.
+        """
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                self.record(driver_command, time.perf_counter() - started)
+        driver.execute = execute
+
+@dataclass
+class SectionResult:
+    name: str
+    wall_sec: float
+    webdriver_sec: float
+    webdriver_commands: int
+    commands: Dict[str, List[float]] = field(default_factory=dict)  # 명령 → [횟수, 초]
+    top_functions: List[List] = field(default_factory=list)          # [함수, 자체 시간, 누적 시간, 호출 수]
+    profile_path: str = ""
+    skipped: str = ""   # CPU 프로파일을 못 남긴 이유(시간/명령 통계만 있음)
+
+    @property
+    def other_sec(self) -> float:
+        """ WebDriver 원격 대기 외 시간(파이썬 처리, 이미지 다운로드 등) """
+        return max(0.0, self.wall_sec - self.webdriver_sec)
+
+class RunProfiler:
+    """
+    enabled=False 이면 아무것도 하지 않는다.
+    결과물은 통합 엑셀 옆 <엑셀 이름>_profile/ 폴더에 저장:
+      <구간>.prof  (pstats/snakeviz 로 열기), <구간>.txt (누적 시간 상위 함수), summary.json
+    파이썬 3.11 이하: cProfile 이 스레드 단위라 크롤링/시트 작성 구간이 겹쳐도 각각 따로 기록된다.
+    파이썬 3.12 이상: cProfile 이 모든 스레드를 함께 기록하므로, 다른 스레드 작업이 섞이지 않도록
+    프로파일 구간을 한 번에 하나씩만 실행한다(프로파일 모드에서는 크롤링과 시트 작성이 겹치지 않음).
+    """
+    def __init__(self, xlsx_path: str, enabled: bool = False, top: int = 15):
+        self.enabled = enabled
+        self.out_dir = os.path.splitext(xlsx_path)[0] + "_profile"
+        self.top = top
+        self.sections: List[SectionResult] = []
+        self._lock = threading.Lock()
+        self._gate = threading.Lock()  # 3.12+: 프로파일 구간 직렬화
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[Optional[CommandStats]]:
+        if not self.enabled:
+            yield None
+            return
+        # 대기 시간은 구간 시간에 넣지 않도록 잠금을 먼저 잡고 측정 시작
+        with (nullcontext() if PER_THREAD_PROFILE else self._gate):
+            commands = CommandStats()
+            prof = cProfile.Profile()
+            skipped = ""
+            try:
+                prof.enable()
+            except ValueError:
+                # 외부 프로파일러/디버거가 이미 켜져 있으면 시간/명령 통계만 기록
+                skipped = "another profiler is active"
+                print(f"[PERF] {name}: CPU 프로파일 생략 ({skipped})")
+            started = time.perf_counter()
+            try:
+                yield commands
+            finally:
+                wall = time.perf_counter() - started
+                if not skipped:
+                    prof.disable()
+                self._record(name, None if skipped else prof, wall, commands, skipped)
+
+    def _record(self, name: str, prof: Optional[cProfile.Profile], wall: float, commands: CommandStats,
+                skipped: str = "") -> None:
+        result = SectionResult(
+            name=name,
+            wall_sec=wall,
+            webdriver_sec=commands.total_sec,
+            webdriver_commands=commands.total_count,
+            commands={cmd: [n, commands.seconds[cmd]] for cmd, n in commands.counts.most_common()},
+            skipped=skipped,
+        )
+        if prof is not None:
+            ensure_dir(self.out_dir)
+            base = os.path.join(self.out_dir, re.sub(r"[^\w.-]", "_", name))
+            result.profile_path = base + ".prof"
+            prof.dump_stats(result.profile_path)
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                pstats.Stats(prof, stream=f).sort_stats("cumulative").print_stats(40)
+            stats = pstats.Stats(prof).stats
+            # 자체 시간(tottime) 기준 상위 함수 → 핫스팟
+            rows = sorted(stats.items(), key=lambda kv: kv[1][2], reverse=True)[:self.top]
+            result.top_functions = [
+                [f"{os.path.basename(file)}:{line}({func})", tt, ct, nc]
+                for (file, line, func), (cc, nc, tt, ct, _) in rows
+            ]
+        with self._lock:
+            self.sections.append(result)
+
+    def summary_lines(self) -> List[str]:
+        lines = []
+        with self._lock:
+            sections = list(self.sections)
+        for s in sections:
+            text = f"[PERF] {s.name}: {s.wall_sec:.1f}초"
+            if s.webdriver_commands:
+                text += f" (WebDriver {s.webdriver_sec:.1f}초/{s.webdriver_commands}회, 그 외 {s.other_sec:.1f}초)"
+            if s.top_functions:
+                hot = ", ".join(f"{fn} {tt:.2f}초" for fn, tt, _, _ in s.top_functions[:3])
+                text += f" 상위: {hot}"
+            if s.skipped:
+                text += f" (CPU 프로파일 없음: {s.skipped})"
+            lines.append(text)
+        return lines
+
+    def write_summary(self) -> str:
+        if not self.enabled:
+            return ""
+        ensure_dir(self.out_dir)
+        path = os.path.join(self.out_dir, "summary.json")
+        with self._lock:
+            data = [dict(asdict(s), other_sec=s.other_sec) for s in self.sections]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return path
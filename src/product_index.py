@@ -0,0 +1,56 @@
+""" 실행(run) 단위 상품 중복 제거 인덱스: goods code → 상세 페이지/이미지 결과 """
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+@dataclass
+class ProductDetail:
+    review_count: int
+    image_url: str
+    img_bytes: bytes
+    ext: str
+
+class ProductIndex:
+    """
+    여러 상점 랭킹에 같은 상품이 등장해도 상세 페이지 방문/이미지 다운로드는 한 번만 하도록
+    goods code 기준으로 결과를 보관한다. 한 번의 실행 동안만 유지(다음 실행에서는 새로 생성).
+    """
+    def __init__(self):
+        self._items: Dict[str, ProductDetail] = {}
+        self._lock = threading.Lock()
+        self.hits = 0       # 재사용(중복 방문 회피) 횟수
+        self.misses = 0     # 실제 방문 횟수
+        self.saved_bytes = 0
+
+    def get(self, code: str) -> Optional[ProductDetail]:
+        if not code:
+            return None
+        with self._lock:
+            detail = self._items.get(code)
+            if detail is not None:
+                self.hits += 1
+                self.saved_bytes += len(detail.img_bytes)
+            return detail
+
+    def put(self, code: str, detail: ProductDetail) -> None:
+        with self._lock:
+            self.misses += 1
+            if code:
+                self._items[code] = detail
+
+    def __contains__(self, code: str) -> bool:
+        """ 재사용 통계에 잡히지 않는 존재 확인 """
+        with self._lock:
+            return code in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        pct = (self.hits / total * 100) if total else 0.0
+        return (f"[DEDUP] 고유 상품 {len(self)}개 / 상품 행 {total}개, "
+                f"중복 {self.hits}건 재사용({pct:.1f}%) → 상세 페이지 {self.hits}회, "
+                f"이미지 {self.saved_bytes / 1024:.0f}KB 다운로드 절약")
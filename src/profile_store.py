@@ -0,0 +1,179 @@
+""" 실행 간 재사용하는 크롬 프로필(user-data-dir) + 디스크 캐시 관리 """
+from __future__ import annotations
+
+import os
+import json
+import shutil
+import socket
+from typing import List, Optional
+
+from utils import ensure_dir
+
+DEFAULT_PROFILE_ROOT = os.path.join(os.path.expanduser("~"), ".qoo10_crawler", "chrome_profiles")
+CACHE_MAX_MB = 256       # 크롬 --disk-cache-size
+PROFILE_MAX_MB = 1024    # 프로필 폴더가 이보다 커지면 초기화
+MAX_SLOTS = 8            # 동시에 쓸 수 있는 프로필 수(워커/세션 수)
+# 크롬 기동 실패 메시지 중 프로필 자체가 원인인 경우(이때만 프로필 초기화)
+PROFILE_ERROR_MARKERS = (
+    "user data directory is already in use",
+    "profile appears to be in use",
+    "cannot create default profile directory",
+    "failed to create a profile",
+)
+
+def _dir_size_mb(path: str) -> float:
+    total = 0
+    for base, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(base, name))
+            except OSError:
+                pass
+    return total / (1024 * 1024)
+
+def _lock_fd(fd: int) -> bool:
+    """ 비차단 배타 잠금. 프로세스가 죽으면(강제 종료 포함) OS 가 잠금을 자동으로 풀어 준다 """
+    try:
+        if os.name == "nt":
+            import msvcrt
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+def _unlock_fd(fd: int) -> None:
+    try:
+        if os.name == "nt":
+            import msvcrt
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+def is_profile_error(e: BaseException) -> bool:
+    """ 드라이버 다운로드/네트워크/버전 불일치가 아니라 프로필 때문에 크롬이 안 뜬 경우 """
+    text = str(e).lower()
+    return any(m in text for m in PROFILE_ERROR_MARKERS)
+
+class ChromeProfile:
+    """ 잠금을 잡은 프로필 슬롯 하나. 세션 종료 후 release() """
+    def __init__(self, path: str, lock_fd: int, cache_mb: int):
+        self.path = ensure_dir(path)
+        self.lock_fd: Optional[int] = lock_fd
+        self.cache_mb = cache_mb
+
+    @property
+    def cache_dir(self) -> str:
+        return os.path.join(self.path, "cache")
+
+    @property
+    def is_warm(self) -> bool:
+        """ 이전 실행에서 채워진 디스크 캐시가 있는지 """
+        if not os.path.isdir(self.cache_dir):
+            return False
+        for _, _, files in os.walk(self.cache_dir):
+            if files:
+                return True
+        return False
+
+    def chrome_args(self) -> List[str]:
+        return [
+            f"--user-data-dir={self.path}",
+            f"--disk-cache-dir={self.cache_dir}",
+            f"--disk-cache-size={self.cache_mb * 1024 * 1024}",
+        ]
+
+    def is_corrupted(self) -> bool:
+        """ 크롬이 비정상 종료되면 상태 JSON 이 깨지는 경우가 있음 """
+        for rel in ("Local State", os.path.join("Default", "Preferences")):
+            p = os.path.join(self.path, rel)
+            if not os.path.exists(p):
+                continue
+            try:
+                with open(p, encoding="utf-8") as f:
+                    json.load(f)
+            except (OSError, ValueError):
+                return True
+        return False
+
+    def reset(self, reason: str) -> None:
+        print(f"[PROFILE] 초기화 ({reason}): {self.path}")
+        shutil.rmtree(self.path, ignore_errors=True)
+        ensure_dir(self.path)
+
+    def release(self) -> None:
+        # 잠금 파일은 지우지 않는다(지우면 다른 프로세스가 옛 파일을 잠그는 경합이 생김)
+        if self.lock_fd is None:
+            return
+        _unlock_fd(self.lock_fd)
+        os.close(self.lock_fd)
+        self.lock_fd = None
+
+class ProfilePool:
+    """
+    root/slot0, slot1 ... 프로필 슬롯을 잠금 파일로 나눠 쓴다.
+    동시에 실행되는 세션(워커 프로세스)마다 서로 다른 슬롯을 받으므로 프로필 충돌이 없다.
+    잠금은 OS 파일 잠금(fcntl/msvcrt)이라 크래시/강제 종료된 프로세스의 슬롯도 바로 다시 쓸 수 있다.
+    """
+    def __init__(self, root: str = DEFAULT_PROFILE_ROOT, cache_mb: int = CACHE_MAX_MB,
+                 max_mb: int = PROFILE_MAX_MB, slots: int = MAX_SLOTS):
+        self.root = ensure_dir(root)
+        self.cache_mb = cache_mb
+        self.max_mb = max_mb
+        self.slots = slots
+
+    def _try_lock(self, lock_path: str) -> Optional[int]:
+        """ 잠금에 성공하면 열린 fd(세션 동안 유지), 이미 사용 중이면 None """
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+        if not _lock_fd(fd):
+            os.close(fd)
+            return None
+        # 진단용: 현재 슬롯을 쓰는 호스트/프로세스
+        try:
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, f"{socket.gethostname()}:{os.getpid()}".encode("utf-8"))
+        except OSError:
+            pass
+        return fd
+
+    def acquire(self) -> ChromeProfile:
+        """ 비어 있는 슬롯을 잠그고, 깨졌거나 너무 커진 프로필은 초기화해서 반환 """
+        for i in range(self.slots):
+            lock_path = os.path.join(self.root, f"slot{i}.lock")
+            fd = self._try_lock(lock_path)
+            if fd is None:
+                continue
+            profile = ChromeProfile(os.path.join(self.root, f"slot{i}"), fd, self.cache_mb)
+            if profile.is_corrupted():
+                profile.reset("corrupted state")
+            else:
+                size = _dir_size_mb(profile.path)
+                if size > self.max_mb:
+                    profile.reset(f"{size:.0f}MB > {self.max_mb}MB")
+            return profile
+        raise RuntimeError(f"사용 가능한 크롬 프로필 슬롯이 없습니다 ({self.slots}개 모두 사용 중): {self.root}")
+
+class LoadStats:
+    """ 세션 첫 페이지(상점 페이지) 로드 시간을 cold/warm 으로 나눠 집계 """
+    def __init__(self):
+        self.samples: dict[str, List[float]] = {"cold": [], "warm": []}
+
+    def add(self, kind: str, seconds: Optional[float]) -> None:
+        if seconds is not None:
+            self.samples.setdefault(kind, []).append(seconds)
+
+    def summary(self) -> str:
+        parts = []
+        for kind in ("cold", "warm"):
+            xs = self.samples.get(kind, [])
+            if xs:
+                parts.append(f"{kind} 평균 {sum(xs) / len(xs):.2f}초({len(xs)}회)")
+        return "[PROFILE] 첫 페이지 로드: " + (", ".join(parts) if parts else "측정값 없음")
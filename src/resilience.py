@@ -0,0 +1,237 @@
+""" 상점 단위 시간 예산 / 재시도(지터) / 서킷 브레이커 """
+from __future__ import annotations
+
+import time
+import random
+import threading
+from collections import deque
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 상점 하나에 쓸 수 있는 최대 시간(초)
+SHOP_TIME_BUDGET_SEC = 90.0
+
+class CrawlError(Exception):
+    """ 크롤링 실패 공통 예외 """
+
+class ShopNotFound(CrawlError):
+    """ 존재하지 않거나 닫힌 상점 (재시도 불필요) """
+
+class EmptyRanking(CrawlError):
+    """ 랭킹 목록이 비어 있음 (재시도 불필요) """
+
+class ShopTimeout(CrawlError):
+    """ 상점 시간 예산 초과 """
+
+class CircuitOpen(CrawlError):
+    """ 최근 실패율이 높아 사이트 요청을 잠시 중단한 상태 """
+
+class Cancelled(CrawlError):
+    """ 사용자 중지 요청 """
+
+# 재시도하지 않는(입력 자체가 잘못됐거나 더 진행하면 안 되는) 실패
+PERMANENT_ERRORS = (ShopNotFound, EmptyRanking, ShopTimeout, CircuitOpen, Cancelled)
+
+class CancelToken:
+    """
+    협조적 취소 토큰. 작업 루프는 check()/wait() 로 취소 여부를 확인하고,
+    on_cancel() 로 등록한 콜백(브라우저 강제 종료 등)은 cancel() 즉시 별도 스레드에서 실행된다.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+        # GUI 스레드에서 호출되므로 콜백이 블로킹되지 않도록 분리 실행
+        for cb in callbacks:
+            threading.Thread(target=_safe_call, args=(cb,), daemon=True).start()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled("cancelled by user")
+
+    def wait(self, seconds: float) -> bool:
+        """ seconds 동안 대기하되 취소되면 바로 True 반환 """
+        return self._event.wait(seconds)
+
+    def on_cancel(self, cb: Callable[[], None]) -> Callable[[], None]:
+        """ 취소 콜백 등록. 반환된 함수를 호출하면 등록 해제 """
+        with self._lock:
+            already = self._event.is_set()
+            if not already:
+                self._callbacks.append(cb)
+        if already:
+            _safe_call(cb)
+
+        def _remove():
+            with self._lock:
+                if cb in self._callbacks:
+                    self._callbacks.remove(cb)
+        return _remove
+
+def _safe_call(cb: Callable[[], None]) -> None:
+    try:
+        cb()
+    except Exception as e:
+        print(f"[CANCEL] 콜백 실패: {e!r}")
+
+class Deadline:
+    """ 상점 시간 예산. remaining() 으로 남은 시간을 대기 타임아웃 상한으로 사용 """
+    def __init__(self, seconds: float = SHOP_TIME_BUDGET_SEC):
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        return max(0.0, self.seconds - self.elapsed())
+
+    def cap(self, timeout: float) -> float:
+        """ 대기 시간을 남은 예산 이내로 제한 (최소 0.1초) """
+        return max(0.1, min(timeout, self.remaining()))
+
+    def extend(self, seconds: float) -> None:
+        """ 상점 탓이 아닌 대기(서킷 cooldown 등)만큼 예산을 늘려 줌 """
+        self.started += seconds
+
+    def check(self, stage: str = "") -> None:
+        if self.remaining() <= 0:
+            raise ShopTimeout(f"time budget {self.seconds:.0f}s exceeded at {stage or 'unknown stage'}")
+
+class CircuitBreaker:
+    """
+    최근 window 개 요청 중 실패 비율이 threshold 이상이면 open → cooldown 동안 요청 차단.
+    cooldown 이 지나면 half-open 으로 한 번 시도해 보고 성공하면 다시 close.
+    """
+    def __init__(self, window: int = 20, threshold: float = 0.5, min_calls: int = 6, cooldown: float = 60.0):
+        self.window = window
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def failure_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def cooldown_left(self) -> float:
+        """ open 상태면 half-open 까지 남은 초, 아니면 0 """
+        with self._lock:
+            if self._state() != "open":
+                return 0.0
+            return self.cooldown - (time.monotonic() - self._opened_at)
+
+    def wait_cooldown(self, cancel: Optional[CancelToken] = None, limit: Optional[float] = None) -> bool:
+        """
+        open 이면 cooldown 이 끝날 때까지 기다린다(이후 half-open 시험 요청이 결과를 결정).
+        limit 초 안에 끝나지 않으면 기다리지 않고 False. 요청해도 되는 상태면 True
+        """
+        while True:
+            left = self.cooldown_left()
+            if left <= 0:
+                return True
+            if limit is not None and left > limit:
+                return False
+            if cancel is not None:
+                if cancel.wait(left):
+                    cancel.check()
+            else:
+                time.sleep(left)
+            if limit is not None:
+                limit -= left
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state() == "open":
+                left = self.cooldown - (time.monotonic() - self._opened_at)
+                raise CircuitOpen(f"circuit open, retry in {left:.0f}s")
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if self._state() == "half-open":
+                # 시험 요청 결과로 바로 결정
+                if ok:
+                    self._opened_at = None
+                    self._outcomes.clear()
+                else:
+                    self._opened_at = time.monotonic()
+                return
+            self._outcomes.append(ok)
+            n = len(self._outcomes)
+            if n >= self.min_calls and self._outcomes.count(False) / n >= self.threshold:
+                self._opened_at = time.monotonic()
+
+def retry_call(fn: Callable[[], T], attempts: int = 3, base_delay: float = 1.0, max_delay: float = 8.0,
+               deadline: Optional[Deadline] = None, breaker: Optional[CircuitBreaker] = None,
+               cancel: Optional[CancelToken] = None) -> T:
+    """
+    일시적 오류에 대해 지수 백오프 + full jitter 로 재시도.
+    PERMANENT_ERRORS 는 바로 올리고, 시간 예산/취소 요청이 있으면 더 시도하지 않는다.
+    서킷이 open 이면 cooldown 을 기다리고, 기다린 시간은 시간 예산에서 빼지 않는다.
+    """
+    last: Optional[BaseException] = None
+    for attempt in range(attempts):
+        if cancel is not None:
+            cancel.check()
+        if breaker is not None:
+            waited = time.monotonic()
+            breaker.wait_cooldown(cancel)
+            if deadline is not None:
+                deadline.extend(time.monotonic() - waited)
+            breaker.before_call()
+        if deadline is not None:
+            deadline.check("retry")
+        try:
+            out = fn()
+        except PERMANENT_ERRORS:
+            raise
+        except Exception as e:
+            last = e
+            # 취소로 인한 드라이버 종료 오류는 실패로 집계하지 않음
+            if cancel is not None:
+                cancel.check()
+            if breaker is not None:
+                breaker.record(False)
+            if attempt == attempts - 1:
+                break
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            if deadline is not None and delay >= deadline.remaining():
+                break
+            if cancel is not None:
+                if cancel.wait(delay):
+                    cancel.check()
+            else:
+                time.sleep(delay)
+            continue
+        if breaker is not None:
+            breaker.record(True)
+        return out
+    raise last
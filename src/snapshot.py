@@ -0,0 +1,177 @@
+""" 원본 HTML/이미지 스냅샷 보관소 (gzip 압축 + 내용 해시 중복 제거) 및 오프라인 재처리(replay) """
+from __future__ import annotations
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from item import ItemRow
+from image import Image
+from utils import ensure_dir, canonical_goods_code, guess_ext_from_url
+
+class SnapshotArchive:
+    """
+    root/
+      blobs/ab/abcdef....gz      내용(sha256) 기준 저장 → 같은 페이지/이미지는 한 번만 저장
+      manifests/<run_id>.jsonl   방문 기록(kind, url, sha256, shop, period, goods_code ...)
+    """
+    def __init__(self, root: str, run_id: Optional[str] = None):
+        self.root = ensure_dir(root)
+        self.run_id = run_id or datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        self._lock = threading.Lock()
+        self.records = 0
+        self.deduped = 0        # 이미 있던 내용이라 새로 쓰지 않은 횟수
+        self.raw_bytes = 0      # 압축 전 크기 합계
+        self.written_bytes = 0  # 실제로 디스크에 쓴 크기 합계
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, "manifests", f"{self.run_id}.jsonl")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.gz")
+
+    def put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        self.raw_bytes += len(data)
+        if os.path.exists(path):
+            self.deduped += 1
+            return digest
+        ensure_dir(os.path.dirname(path))
+        # 쓰는 도중 중단돼도 깨진 파일이 남지 않도록 임시 파일 → rename
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wb", compresslevel=6) as f:
+            f.write(data)
+        self.written_bytes += os.path.getsize(tmp)
+        os.replace(tmp, path)
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        with gzip.open(self._blob_path(digest), "rb") as f:
+            return f.read()
+
+    def record(self, kind: str, url: str, data: bytes, **meta: Any) -> str:
+        """ kind: ranking / product / image """
+        with self._lock:
+            digest = self.put_blob(data)
+            entry = {"kind": kind, "url": url, "sha256": digest, "fetched_at": time.time(), **meta}
+            ensure_dir(os.path.dirname(self.manifest_path))
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.records += 1
+            return digest
+
+    def put_page(self, kind: str, url: str, html: str, **meta: Any) -> str:
+        return self.record(kind, url, html.encode("utf-8"), **meta)
+
+    def get_page(self, digest: str) -> str:
+        return self.get_blob(digest).decode("utf-8")
+
+    def manifest(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def runs(self) -> List[str]:
+        d = os.path.join(self.root, "manifests")
+        if not os.path.isdir(d):
+            return []
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(d) if name.endswith(".jsonl"))
+
+    def summary(self) -> str:
+        return (f"[SNAPSHOT] {self.records}건 기록 (중복 {self.deduped}건), "
+                f"원본 {self.raw_bytes / 1024:.0f}KB → 저장 {self.written_bytes / 1024:.0f}KB "
+                f"({self.manifest_path})")
+
+def replay_run(root: str, run_id: str) -> List[tuple[str, List[ItemRow], List[Image]]]:
+    """
+    스냅샷만으로 실행 결과를 다시 만든다(브라우저/네트워크 없음).
+    반환값: 상점 순서대로 (shop, results, images) — CrawlerManager.run_shop 결과와 같은 형태
+    """
+    from page_parser import parse_ranking, parse_product
+
+    archive = SnapshotArchive(root, run_id)
+    entries = archive.manifest()
+    products = {e["goods_code"]: e for e in entries if e["kind"] == "product"}
+    images = {e["url"]: e for e in entries if e["kind"] == "image"}
+    parsed: Dict[str, tuple[int, str]] = {}  # goods code → (리뷰 수, 이미지 URL), 상품 페이지는 한 번만 파싱
+
+    out = []
+    for e in entries:
+        if e["kind"] != "ranking":
+            continue
+        results: List[ItemRow] = []
+        shop_images: List[Image] = []
+        for row in parse_ranking(archive.get_page(e["sha256"]), e["url"]):
+            goods_code = canonical_goods_code(row["product_url"])
+            if goods_code not in parsed:
+                p = products.get(goods_code)
+                parsed[goods_code] = parse_product(archive.get_page(p["sha256"]), p["url"]) if p else (0, "")
+            review_cnt, image_url = parsed[goods_code]
+            img = images.get(image_url)
+            results.append(ItemRow(
+                name=row["name"],
+                price_jpy=row["price_jpy"],
+                price_krw=row["price_krw"],
+                review_count=review_cnt,
+                image_url=image_url,
+                image_path="",
+                product_url=row["product_url"],
+                shop_name=e["shop"],
+                total_count=row["total_count"],
+                goods_code=goods_code
+            ))
+            shop_images.append(Image(
+                idx=row["idx"],
+                img_bytes=archive.get_blob(img["sha256"]) if img else b"",
+                ext=guess_ext_from_url(image_url)
+            ))
+        out.append((e["shop"], results, shop_images))
+    return out
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Qoo10 HTML 스냅샷 보관소")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    pl = sub.add_parser("list", help="보관된 실행(run) 목록")
+    pl.add_argument("root")
+
+    pr = sub.add_parser("replay", help="스냅샷만으로 통합 엑셀 다시 만들기")
+    pr.add_argument("root")
+    pr.add_argument("run_id")
+    pr.add_argument("--outdir", default="./results")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "list":
+        for run_id in SnapshotArchive(args.root).runs():
+            print(run_id)
+        return
+
+    from workbook import new_ranking_workbook, append_to_worksheet
+    from analytics import add_summary_sheet
+    from utils import autosize_text_columns
+
+    start = time.perf_counter()
+    shops = replay_run(args.root, args.run_id)
+    parsed_sec = time.perf_counter() - start
+    work_book, work_sheet = new_ranking_workbook()
+    for _, results, images in shops:
+        append_to_worksheet(work_sheet, results, images)
+    periods = {e.get("period") for e in SnapshotArchive(args.root, args.run_id).manifest() if e["kind"] == "ranking"}
+    add_summary_sheet(work_book, [r for _, results, _ in shops for r in results],
+                      periods.pop() if len(periods) == 1 else "?", args.run_id)
+    autosize_text_columns(work_sheet, skip_letters={"I"})
+    xlsx_path = os.path.join(ensure_dir(args.outdir), f"qoo10_top5_{args.run_id}_replay.xlsx")
+    work_book.save(xlsx_path)
+    print(f"[REPLAY] 상점 {len(shops)}개, 파싱 {parsed_sec:.2f}초, 전체 {time.perf_counter() - start:.2f}초 → {xlsx_path}")
+
+if __name__ == "__main__":
+    main()
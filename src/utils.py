@@ -2,6 +2,7 @@ import os
 import re
 import pathlib
 
+from urllib.parse import urlsplit
 from selenium.webdriver.common.by import By
 from datetime import timedelta
 
@@ -25,11 +26,38 @@ def try_attr(parent, sel, attr):
     try: return parent.find_element(By.CSS_SELECTOR, sel).get_attribute(attr) or ""
     except: return ""
 
-def fetch_image_bytes(url: str) -> bytes:
+def fetch_image_bytes(url: str, timeout: float = 15, cancel=None) -> bytes:
     # utils에 같은 함수가 없다면 아래 구현을 사용하세요.
+    # cancel(CancelToken)이 주어지면 청크 단위로 읽으며 취소 여부를 확인
     import urllib.request
-    with urllib.request.urlopen(url) as resp:
-        return resp.read()
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        if cancel is None:
+            return resp.read()
+        chunks = []
+        while True:
+            cancel.check()
+            chunk = resp.read(64 * 1024)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+def canonical_goods_code(url: str) -> str:
+    """
+    상품 URL → 상품 고유 코드(goods code).
+    트래킹 쿼리(?banner_no=..., &ga_...)만 다른 URL도 같은 코드로 정규화. 코드를 못 찾으면 쿼리/프래그먼트를 뗀 URL.
+    """
+    if not url:
+        return ""
+    m = re.search(r"[?&]goods_?code=(\d+)", url, re.IGNORECASE)
+    if m:
+        return m.group(1)
+    path = urlsplit(url).path
+    m = re.search(r"/(?:g|item/[^/]+)/(\d+)", path, re.IGNORECASE) or re.search(r"/(\d{6,})/?$", path)
+    if m:
+        return m.group(1)
+    p = urlsplit(url)
+    return f"{p.netloc.lower()}{p.path.rstrip('/')}"
 
 def guess_ext_from_url(url: str, default: str = "jpg") -> str:
     m = re.search(r"\.(png|jpe?g|gif|webp|bmp)(?:\?|$)", url, re.IGNORECASE)
@@ -0,0 +1,541 @@
+""" 여러 프로세스/호스트가 하나의 상점 목록을 나눠 크롤링하기 위한 작업 큐 (SQLite 파일 기반) """
+from __future__ import annotations
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from item import ItemRow
+from image import Image
+from utils import ensure_dir, autosize_text_columns
+from resilience import (ShopNotFound, EmptyRanking, ShopTimeout, CircuitOpen, Cancelled, CancelToken,
+                        SHOP_TIME_BUDGET_SEC)
+
+# 리스 유지 시간 / 하트비트 주기(초). 하트비트가 LEASE_SEC 동안 없으면 죽은 워커로 보고 재할당
+LEASE_SEC = 120
+HEARTBEAT_SEC = 30
+STOP_POLL_SEC = 1.0     # 워커가 중지 요청을 확인하는 주기
+WORKER_STOP_SEC = 15    # 코디네이터 중지 시 로컬 워커가 브라우저를 닫고 끝나길 기다리는 시간
+MAX_ATTEMPTS = 3
+DEFAULT_DB_NAME = "qoo10_queue.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id      TEXT    NOT NULL,
+    shop        TEXT    NOT NULL,
+    period      TEXT    NOT NULL,
+    status      TEXT    NOT NULL DEFAULT 'pending',  -- pending / leased / done / failed
+    worker      TEXT,
+    lease_until REAL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs(status, seq);
+-- 완료된 작업의 상품 행. 큐 파일을 공유 폴더에 두므로 pickle 대신 JSON + 이미지 BLOB 으로만 저장
+CREATE TABLE IF NOT EXISTS items (
+    job_seq     INTEGER NOT NULL,
+    pos         INTEGER NOT NULL,
+    item        TEXT    NOT NULL,                     -- ItemRow 필드(JSON)
+    img_idx     INTEGER NOT NULL,
+    img_ext     TEXT    NOT NULL,
+    img_bytes   BLOB    NOT NULL,
+    PRIMARY KEY (job_seq, pos)
+);
+"""
+
+@dataclass
+class Job:
+    seq: int
+    run_id: str
+    shop: str
+    period: str
+    attempts: int
+
+@dataclass
+class JobResult:
+    shop: str
+    status: str
+    results: List[ItemRow]
+    images: List[Image]
+    error: str
+
+_ITEM_FIELDS = {f.name for f in fields(ItemRow)}
+
+def _item_from_json(text: str) -> ItemRow:
+    """ 알 수 없는 키는 버리고 ItemRow 로 복원 """
+    data = json.loads(text)
+    return ItemRow(**{k: v for k, v in data.items() if k in _ITEM_FIELDS})
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class ShopQueue:
+    """
+    상점 단위 작업 큐.
+    DB 파일을 공유 폴더에 두면 여러 호스트의 워커가 같은 큐를 사용할 수 있다.
+    (네트워크 파일시스템 호환을 위해 WAL 모드는 사용하지 않음)
+    """
+    def __init__(self, db_path: str, lease_sec: float = LEASE_SEC, max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        ensure_dir(os.path.dirname(os.path.abspath(db_path)))
+        con = self._connect()
+        try:
+            con.executescript(SCHEMA)
+        finally:
+            con.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None -> 자동 커밋, 필요한 곳만 BEGIN IMMEDIATE 로 쓰기 잠금
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _write(self, fn):
+        """ 쓰기 트랜잭션 헬퍼: 다른 워커와 동시에 같은 작업을 가져가지 않도록 즉시 잠금 """
+        con = self._connect()
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(con)
+                con.execute("COMMIT")
+                return out
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+        finally:
+            con.close()
+
+    # ---------- 코디네이터 ----------
+    def enqueue(self, run_id: str, shops: list[str], period: str) -> int:
+        def _fn(con):
+            con.executemany(
+                "INSERT INTO jobs(run_id, shop, period) VALUES (?, ?, ?)",
+                [(run_id, s, period) for s in shops]
+            )
+            return len(shops)
+        return self._write(_fn)
+
+    def requeue_expired(self) -> int:
+        """ 리스가 만료된(하트비트가 끊긴) 작업을 다시 pending 으로 돌림 """
+        def _fn(con):
+            return self._requeue_expired(con)
+        return self._write(_fn)
+
+    def _requeue_expired(self, con: sqlite3.Connection) -> int:
+        now = time.time()
+        # 재시도 횟수를 다 쓴 작업은 failed 처리
+        con.execute(
+            "UPDATE jobs SET status='failed', worker=NULL, error=COALESCE(error, 'lease expired') "
+            "WHERE status='leased' AND lease_until < ? AND attempts >= ?",
+            (now, self.max_attempts)
+        )
+        cur = con.execute(
+            "UPDATE jobs SET status='pending', worker=NULL, lease_until=NULL "
+            "WHERE status='leased' AND lease_until < ?",
+            (now,)
+        )
+        return cur.rowcount
+
+    def counts(self, run_id: Optional[str] = None) -> dict[str, int]:
+        con = self._connect()
+        try:
+            if run_id is None:
+                rows = con.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+            else:
+                rows = con.execute(
+                    "SELECT status, COUNT(*) FROM jobs WHERE run_id=? GROUP BY status", (run_id,)
+                ).fetchall()
+        finally:
+            con.close()
+        return {status: n for status, n in rows}
+
+    def is_finished(self, run_id: Optional[str] = None) -> bool:
+        """ run_id 를 주면 그 실행만, 아니면 큐 전체 기준 """
+        c = self.counts(run_id)
+        return c.get("pending", 0) == 0 and c.get("leased", 0) == 0
+
+    def cancel_run(self, run_id: str) -> int:
+        """ 아직 끝나지 않은 작업을 모두 failed(cancelled) 로 표시 → 다른 워커가 더 가져가지 않음 """
+        def _fn(con):
+            cur = con.execute(
+                "UPDATE jobs SET status='failed', worker=NULL, lease_until=NULL, error='cancelled' "
+                "WHERE run_id=? AND status IN ('pending', 'leased')",
+                (run_id,)
+            )
+            return cur.rowcount
+        return self._write(_fn)
+
+    def results(self, run_id: str) -> list[JobResult]:
+        """ 등록 순서(seq)대로 작업 결과 반환 """
+        con = self._connect()
+        try:
+            jobs = con.execute(
+                "SELECT seq, shop, status, error FROM jobs WHERE run_id=? ORDER BY seq", (run_id,)
+            ).fetchall()
+            rows = con.execute(
+                "SELECT i.job_seq, i.item, i.img_idx, i.img_ext, i.img_bytes FROM items i "
+                "JOIN jobs j ON j.seq = i.job_seq WHERE j.run_id=? AND j.status='done' ORDER BY i.job_seq, i.pos",
+                (run_id,)
+            ).fetchall()
+        finally:
+            con.close()
+        out = {seq: JobResult(shop=shop, status=status, results=[], images=[], error=error or "")
+               for seq, shop, status, error in jobs}
+        for seq, item, img_idx, img_ext, img_bytes in rows:
+            out[seq].results.append(_item_from_json(item))
+            out[seq].images.append(Image(idx=img_idx, img_bytes=bytes(img_bytes), ext=img_ext))
+        return list(out.values())
+
+    def purge_run(self, run_id: str, vacuum: bool = True) -> int:
+        """ 통합 엑셀을 만든 실행의 작업/상품 행 삭제(+ VACUUM 으로 파일 크기 회수). 삭제한 작업 수 반환 """
+        def _fn(con):
+            con.execute("DELETE FROM items WHERE job_seq IN (SELECT seq FROM jobs WHERE run_id=?)", (run_id,))
+            return con.execute("DELETE FROM jobs WHERE run_id=?", (run_id,)).rowcount
+        n = self._write(_fn)
+        if vacuum:
+            con = self._connect()
+            try:
+                con.execute("VACUUM")
+            finally:
+                con.close()
+        return n
+
+    # ---------- 워커 ----------
+    def lease(self, worker_id: str, run_id: Optional[str] = None) -> Optional[Job]:
+        """ run_id 를 주면 그 실행의 작업만 가져온다 """
+        def _fn(con):
+            self._requeue_expired(con)
+            if run_id is None:
+                row = con.execute(
+                    "SELECT seq, run_id, shop, period, attempts FROM jobs WHERE status='pending' ORDER BY seq LIMIT 1"
+                ).fetchone()
+            else:
+                row = con.execute(
+                    "SELECT seq, run_id, shop, period, attempts FROM jobs "
+                    "WHERE status='pending' AND run_id=? ORDER BY seq LIMIT 1",
+                    (run_id,)
+                ).fetchone()
+            if row is None:
+                return None
+            seq, job_run, shop, period, attempts = row
+            con.execute(
+                "UPDATE jobs SET status='leased', worker=?, lease_until=?, attempts=attempts+1 WHERE seq=?",
+                (worker_id, time.time() + self.lease_sec, seq)
+            )
+            return Job(seq=seq, run_id=job_run, shop=shop, period=period, attempts=attempts + 1)
+        return self._write(_fn)
+
+    def heartbeat(self, seq: int, worker_id: str) -> bool:
+        """ 리스 연장. 이미 다른 워커에게 넘어간 작업이면 False """
+        def _fn(con):
+            cur = con.execute(
+                "UPDATE jobs SET lease_until=? WHERE seq=? AND worker=? AND status='leased'",
+                (time.time() + self.lease_sec, seq, worker_id)
+            )
+            return cur.rowcount == 1
+        return self._write(_fn)
+
+    def complete(self, seq: int, worker_id: str, results: list[ItemRow], images: list[Image]) -> bool:
+        rows = [
+            (seq, pos, json.dumps(asdict(r), ensure_ascii=False), img.idx, img.ext, img.img_bytes or b"")
+            for pos, (r, img) in enumerate(zip(results, images))
+        ]
+        def _fn(con):
+            cur = con.execute(
+                "UPDATE jobs SET status='done', error=NULL, lease_until=NULL "
+                "WHERE seq=? AND worker=? AND status='leased'",
+                (seq, worker_id)
+            )
+            if cur.rowcount != 1:
+                return False
+            con.execute("DELETE FROM items WHERE job_seq=?", (seq,))
+            con.executemany(
+                "INSERT INTO items(job_seq, pos, item, img_idx, img_ext, img_bytes) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            return True
+        return self._write(_fn)
+
+    def fail(self, seq: int, worker_id: str, error: str, permanent: bool = False) -> None:
+        """ 재시도 가능하면 pending 으로, 아니면(permanent 포함) failed 로 표시 """
+        max_attempts = 0 if permanent else self.max_attempts
+        def _fn(con):
+            con.execute(
+                "UPDATE jobs SET status=CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker=NULL, lease_until=NULL, error=? "
+                "WHERE seq=? AND worker=? AND status='leased'",
+                (max_attempts, error, seq, worker_id)
+            )
+        self._write(_fn)
+
+    def release(self, seq: int, worker_id: str, error: str) -> None:
+        """ 작업 탓이 아닌 실패(서킷 open 등) → 시도 횟수를 되돌리고 pending 으로 """
+        def _fn(con):
+            con.execute(
+                "UPDATE jobs SET status='pending', worker=NULL, lease_until=NULL, error=?, attempts=attempts-1 "
+                "WHERE seq=? AND worker=? AND status='leased'",
+                (error, seq, worker_id)
+            )
+        self._write(_fn)
+
+class _Heartbeat:
+    """
+    크롤링 중 백그라운드에서 주기적으로 리스를 연장.
+    리스를 잃거나(코디네이터 취소/재할당) 중지 요청(stop)이 오면 cancel 토큰을 취소해 크롤링을 바로 끝낸다.
+    """
+    def __init__(self, q: ShopQueue, job: Job, worker_id: str, cancel: CancelToken,
+                 stop: Optional[Any] = None, interval: float = HEARTBEAT_SEC):
+        self.q = q
+        self.job = job
+        self.worker_id = worker_id
+        self.cancel = cancel
+        self.stop = stop
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        next_beat = time.monotonic() + self.interval
+        while not self._stop.wait(STOP_POLL_SEC):
+            if self.stop is not None and self.stop.is_set():
+                print(f"[QUEUE] 중지 요청: {self.job.shop}")
+                self.cancel.cancel()
+                return
+            if time.monotonic() < next_beat:
+                continue
+            next_beat = time.monotonic() + self.interval
+            try:
+                if not self.q.heartbeat(self.job.seq, self.worker_id):
+                    print(f"[QUEUE] lease lost: {self.job.shop}")
+                    self.cancel.cancel()
+                    return
+            except sqlite3.Error as e:
+                print(f"[QUEUE] heartbeat 실패: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+def run_worker(db_path: str, save_path: str = "./results", worker_id: Optional[str] = None,
+               exit_when_idle: bool = True, poll_sec: float = 2.0, tabs: int = 1,
+               reuse_profile: bool = False, run_id: Optional[str] = None, stop: Optional[Any] = None,
+               time_budget: float = SHOP_TIME_BUDGET_SEC) -> int:
+    """
+    큐에서 상점을 하나씩 빌려(lease) 크롤링하고 결과를 큐에 돌려준다.
+    exit_when_idle=False 이면 새 작업을 계속 기다린다(상주 워커).
+    run_id 를 주면 그 실행의 작업만 처리한다(이전에 비정상 종료된 실행의 작업은 건드리지 않음).
+    stop(multiprocessing.Event)이 설정되면 진행 중인 크롤링을 취소하고(브라우저/프로필 정리) 종료한다.
+    반환값: 처리 완료한 상점 수
+    """
+    from cralwer_manager import CrawlerManager
+
+    worker_id = worker_id or default_worker_id()
+    q = ShopQueue(db_path)
+    done = 0
+    manager = None
+    current_run = None
+    print(f"[WORKER] {worker_id} 시작 (db={db_path})")
+    while stop is None or not stop.is_set():
+        job = q.lease(worker_id, run_id)
+        if job is None:
+            if exit_when_idle and q.is_finished(run_id):
+                break
+            if stop is not None:
+                stop.wait(poll_sec)
+            else:
+                time.sleep(poll_sec)
+            continue
+
+        print(f"[WORKER] {worker_id} <- {job.shop} (period={job.period}, attempt={job.attempts})")
+        cancel = CancelToken()  # 작업 단위: 리스를 잃거나 중지 요청 시 취소
+        try:
+            with _Heartbeat(q, job, worker_id, cancel, stop):
+                manager = CrawlerManager.get(save_path=save_path, period=job.period)
+                # 실행(run)이 바뀌면 상품 중복 제거 인덱스도 새로 시작
+                if job.run_id != current_run:
+                    if current_run is not None:
+                        print(manager.product_index.summary())
+                        print(manager.load_stats.summary())
+                    manager.start_run()
+                    manager.tabs = tabs
+                    manager.time_budget = time_budget
+                    manager.use_profiles(reuse_profile)
+                    current_run = job.run_id
+                manager.cancel = cancel
+                crawler = manager.run_shop(job.shop)
+            if q.complete(job.seq, worker_id, crawler.results, crawler.images):
+                done += 1
+            else:
+                print(f"[WORKER] {job.shop} 결과 폐기 (리스 만료 후 재할당됨)")
+        except (ShopNotFound, EmptyRanking) as e:
+            # 입력 자체가 잘못된 상점은 다른 워커가 다시 시도해도 소용없음
+            q.fail(job.seq, worker_id, repr(e), permanent=True)
+            print(f"[WORKER] {job.shop} 건너뜀: {e}")
+        except ShopTimeout as e:
+            # 처음부터 다시 시도해도 같은 예산에 걸리므로, 수집된 행으로 완료 처리(없으면 실패)
+            partial = manager.crawler if manager is not None else None
+            if partial is not None and partial.results:
+                if q.complete(job.seq, worker_id, partial.results, partial.images):
+                    done += 1
+                print(f"[WORKER] {job.shop} 시간 초과: {e} (수집된 {len(partial.results)}행 기록)")
+            else:
+                q.fail(job.seq, worker_id, repr(e), permanent=True)
+                print(f"[WORKER] {job.shop} 시간 초과: {e} (수집된 행 없음)")
+        except Cancelled as e:
+            # 코디네이터가 취소했거나 다른 워커에게 넘어간 작업 → 결과를 쓰지 않음
+            print(f"[WORKER] {job.shop} 취소: {e}")
+        except CircuitOpen as e:
+            # 사이트 상태 문제 → 시도 횟수를 쓰지 않고 되돌림(다음 run 에서 cooldown 을 기다린 뒤 재개)
+            q.release(job.seq, worker_id, repr(e))
+            print(f"[WORKER] {job.shop} 보류: {e}")
+        except Exception as e:
+            q.fail(job.seq, worker_id, repr(e))
+            print(f"[WORKER] {job.shop} 실패: {e!r}")
+    if manager is not None:
+        print(manager.product_index.summary())
+        print(manager.load_stats.summary())
+    print(f"[WORKER] {worker_id} 종료 (완료 {done}개)")
+    return done
+
+def run_coordinator(shops: list[str], outdir: str, period: str, db_path: Optional[str] = None,
+                    local_workers: int = 1, poll_sec: float = 2.0,
+                    log: Callable[[str], None] = print,
+                    on_progress: Optional[Callable[[int, int], None]] = None,
+                    cancel: Optional[CancelToken] = None,
+                    time_budget: float = SHOP_TIME_BUDGET_SEC, tabs: int = 1,
+                    reuse_profile: bool = False) -> str:
+    """
+    상점을 큐에 등록하고 모든 작업이 끝날 때까지 기다린 뒤 통합 엑셀을 만든다.
+    local_workers 만큼 이 호스트에서도 워커 프로세스를 띄운다(0이면 외부 워커만 사용).
+    tabs/reuse_profile/time_budget 은 로컬 워커에 그대로 전달된다.
+    cancel 이 취소되면 남은 작업을 취소 처리하고(외부 워커는 리스를 잃고 스스로 중단)
+    로컬 워커에 중지를 요청해 브라우저를 정리하고 끝나길 기다린 뒤 완료분만 조립한다.
+    반환값: 저장된 통합 엑셀 경로
+    """
+    from workbook import new_ranking_workbook, append_to_worksheet
+    from analytics import add_summary_sheet
+
+    ensure_dir(outdir)
+    db_path = db_path or os.path.join(outdir, DEFAULT_DB_NAME)
+    ts = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    run_id = f"{ts}-{os.getpid()}"
+    combined_path = os.path.join(outdir, f"qoo10_top5_{ts}.xlsx")
+
+    q = ShopQueue(db_path)
+    q.enqueue(run_id, shops, period)
+    log(f"[QUEUE] {len(shops)}개 상점 등록 (run={run_id}, db={db_path})")
+
+    stop = multiprocessing.Event()
+    procs = []
+    for n in range(local_workers):
+        p = multiprocessing.Process(
+            target=run_worker,
+            args=(db_path, outdir, f"{default_worker_id()}-w{n}"),
+            kwargs={"run_id": run_id, "stop": stop, "time_budget": time_budget,
+                    "tabs": tabs, "reuse_profile": reuse_profile},
+            daemon=True
+        )
+        p.start()
+        procs.append(p)
+
+    total = len(shops)
+    last_finished = -1
+    while True:
+        if cancel is not None and cancel.is_cancelled:
+            n = q.cancel_run(run_id)
+            stop.set()
+            log(f"[CANCEL] 남은 {n}개 작업 취소, 로컬 워커 종료 대기")
+            deadline = time.monotonic() + WORKER_STOP_SEC
+            for p in procs:
+                p.join(timeout=max(0.0, deadline - time.monotonic()))
+                if p.is_alive():
+                    # 정상 종료를 못 한 경우에만 강제 종료
+                    p.terminate()
+                    log(f"[WARN] 워커 {p.pid} 강제 종료")
+            break
+        requeued = q.requeue_expired()
+        if requeued:
+            log(f"[QUEUE] 만료된 리스 {requeued}개 재등록")
+        c = q.counts(run_id)
+        finished = c.get("done", 0) + c.get("failed", 0)
+        if finished != last_finished:
+            last_finished = finished
+            if on_progress:
+                on_progress(finished, total)
+        if finished >= total:
+            break
+        if cancel is not None:
+            cancel.wait(poll_sec)
+        else:
+            time.sleep(poll_sec)
+
+    for p in procs:
+        p.join(timeout=poll_sec)
+
+    # 등록 순서대로 통합 파일 조립
+    work_book, work_sheet = new_ranking_workbook()
+    items = []
+    for r in q.results(run_id):
+        if r.status == "done":
+            append_to_worksheet(work_sheet, r.results, r.images)
+            items.extend(r.results)
+        else:
+            log(f"[ERROR] {r.shop} 실패: {r.error}")
+    add_summary_sheet(work_book, items, period, ts)
+    autosize_text_columns(work_sheet, skip_letters={"I"})
+    work_book.save(combined_path)
+    log(f"[SAVE] 결과 저장: {combined_path}")
+    # 조립이 끝난 실행의 이미지/상품 행은 큐 파일에서 지움 → 실행이 쌓여도 파일이 커지지 않음
+    try:
+        q.purge_run(run_id)
+    except sqlite3.Error as e:
+        log(f"[WARN] 큐 정리 실패: {e}")
+    return combined_path
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Qoo10 분산 크롤링 작업 큐")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    pc = sub.add_parser("coordinator", help="상점 등록 + 결과 조립")
+    pc.add_argument("shops", nargs="+")
+    pc.add_argument("--outdir", default="./results")
+    pc.add_argument("--period", default="W", choices=["D", "W", "M"])
+    pc.add_argument("--db", default=None)
+    pc.add_argument("--local-workers", type=int, default=1)
+    pc.add_argument("--time-budget", type=float, default=SHOP_TIME_BUDGET_SEC, help="상점 하나의 최대 시간(초)")
+    pc.add_argument("--tabs", type=int, default=1, help="로컬 워커의 상품 상세 페이지 동시 탭 수")
+    pc.add_argument("--profile", action="store_true", help="로컬 워커가 크롬 프로필/디스크 캐시 재사용")
+
+    pw = sub.add_parser("worker", help="큐에서 상점을 가져와 크롤링")
+    pw.add_argument("--db", required=True)
+    pw.add_argument("--outdir", default="./results")
+    pw.add_argument("--id", default=None)
+    pw.add_argument("--run", default=None, help="이 실행(run_id)의 작업만 처리")
+    pw.add_argument("--forever", action="store_true", help="작업이 없어도 종료하지 않고 대기")
+    pw.add_argument("--tabs", type=int, default=1, help="상품 상세 페이지 동시 탭 수")
+    pw.add_argument("--profile", action="store_true", help="크롬 프로필/디스크 캐시 재사용")
+    pw.add_argument("--time-budget", type=float, default=SHOP_TIME_BUDGET_SEC, help="상점 하나의 최대 시간(초)")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "coordinator":
+        run_coordinator(args.shops, args.outdir, args.period, db_path=args.db, local_workers=args.local_workers,
+                        time_budget=args.time_budget, tabs=args.tabs, reuse_profile=args.profile)
+    else:
+        run_worker(args.db, args.outdir, worker_id=args.id, exit_when_idle=not args.forever, tabs=args.tabs,
+                   reuse_profile=args.profile, run_id=args.run, time_budget=args.time_budget)
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,412 @@
+import io
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Optional
+from openpyxl import Workbook
+from openpyxl.drawing.image import Image as XLImage
+from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
+from utils import excel_col_width_to_pixels, pixels_to_row_height_points, autosize_text_columns
+from item import ItemRow
+from image import Image
+from perf_profile import RunProfiler
+from analytics import add_summary_sheet, run_key
+
+HEADERS_XLSX = ["Rank", "Name", "Price(JPY)", "Price(KRW)", "Reviews",
+                "Product URL", "Shop", "Total Count", "Image"]
+INDEX_HEADERS = ["Shop", "Items", "File", "Status"]
+SHARD_WORKERS = 2            # 분할 파일을 동시에 저장하는 프로세스 수
+ROW_OVERHEAD_BYTES = 1024    # 용량 기준 분할 시 이미지 외 행 하나당 추정 크기
+
+def new_ranking_workbook() -> tuple[Workbook, Worksheet]:
+    """ 헤더 스타일이 적용된 ranking 시트를 가진 통합 워크북 생성 """
+    # 엑셀 워크 시트 준비하기
+    work_book = Workbook()
+    work_sheet: Worksheet = work_book.active
+    # 시트명
+    work_sheet.title = "ranking"
+    # 컬럼명 지정
+    work_sheet.append(HEADERS_XLSX)
+    header_fill = PatternFill("solid", fgColor="F3F6FA")
+    header_font = Font(bold=True, color="1F2937")
+    header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    thin = Side(style="thin", color="DDDDDD")
+    header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    # 헤더 행 높이/프리즈/오토필터
+    work_sheet.row_dimensions[1].height = 22
+    work_sheet.freeze_panes = "A2"
+    work_sheet.auto_filter.ref = f"A1:I1"   # 범위는 데이터 추가 후 아래에서 다시 확장
+
+    # 헤더 각 셀 스타일 적용 & 기본 너비(가독성 위주)
+    pref_widths = [8, 40, 12, 12, 10, 50, 14, 12, 25]  # A..I
+    for col_idx, _ in enumerate(HEADERS_XLSX, start=1):
+        cell = work_sheet.cell(row=1, column=col_idx)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_align
+        cell.border = header_border
+        col_letter = get_column_letter(col_idx)
+        work_sheet.column_dimensions[col_letter].width = pref_widths[col_idx-1]
+    return work_book, work_sheet
+
+def append_to_worksheet(work_sheet: Worksheet, data_results: list[ItemRow], images: list[Image]) -> int:
+    if not data_results:
+        return 0
+
+    img_col_letter = "I"
+    # 이미지 열 폭은 헤더 단계에서 지정되었다고 가정(없으면 기본 지정)
+    if not work_sheet.column_dimensions[img_col_letter].width:
+        work_sheet.column_dimensions[img_col_letter].width = 25
+    target_col_px = excel_col_width_to_pixels(work_sheet.column_dimensions[img_col_letter].width)
+
+    # ✅ 본문 공통 스타일
+    thin = Side(style="thin", color="EEEEEE")
+    body_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    align_left  = Alignment(horizontal="left",  vertical="center", wrap_text=True)
+    align_right = Alignment(horizontal="right", vertical="center")
+    align_center= Alignment(horizontal="center",vertical="center")
+
+    # 줄무늬(밴드) 색
+    band_fill = PatternFill("solid", fgColor="FAFAFA")
+    row_idx = work_sheet.max_row + 1
+    for i, r in enumerate(data_results, start=1):
+        # Rank
+        c = work_sheet.cell(row=row_idx, column=1, value=i)
+        c.alignment = align_center; c.border = body_border
+
+        # Name
+        c = work_sheet.cell(row=row_idx, column=2, value=r.name)
+        c.alignment = align_left; c.border = body_border
+
+        # Price(JPY)
+        c = work_sheet.cell(row=row_idx, column=3, value=r.price_jpy)
+        c.number_format = '#,##0'; c.alignment = align_right; c.border = body_border
+
+        # Price(KRW)
+        c = work_sheet.cell(row=row_idx, column=4, value=r.price_krw)
+        c.number_format = '#,##0'; c.alignment = align_right; c.border = body_border
+
+        # Reviews
+        c = work_sheet.cell(row=row_idx, column=5, value=r.review_count)
+        c.number_format = '#,##0'; c.alignment = align_center; c.border = body_border
+
+        # Product URL (하이퍼링크 + 파란 밑줄)
+        c = work_sheet.cell(row=row_idx, column=6, value=r.product_url)
+        c.hyperlink = r.product_url
+        c.style = "Hyperlink"
+        c.alignment = align_left
+        c.border = body_border
+
+        # Shop
+        c = work_sheet.cell(row=row_idx, column=7, value=r.shop_name)
+        c.alignment = align_left; c.border = body_border
+
+        # Total Count (문자면 그대로, 숫자면 포맷)
+        c = work_sheet.cell(row=row_idx, column=8, value=r.total_count)
+        try:
+            float(r.total_count)
+            c.number_format = '#,##0'
+            c.alignment = align_right
+        except Exception:
+            c.alignment = align_left
+        c.border = body_border
+
+        # ✅ 밴드 채우기(가독성) — 데이터 영역 전체 셀에 적용
+        if (row_idx % 2) == 0:
+            for col in range(1, 9):  # A..H (이미지 I 제외)
+                work_sheet.cell(row=row_idx, column=col).fill = band_fill
+
+        # 이미지(I열) — 대표 이미지를 못 가져온 상품은 비워 둠
+        img_info = images[i-1]
+        if img_info.img_bytes:
+            xlimg = XLImage(io.BytesIO(img_info.img_bytes))
+            orig_w, orig_h = float(xlimg.width), float(xlimg.height)
+            scale = min(1.0, target_col_px / orig_w) if orig_w > 0 else 1.0
+            xlimg.width = orig_w * scale
+            xlimg.height = orig_h * scale
+
+            work_sheet.row_dimensions[row_idx].height = pixels_to_row_height_points(xlimg.height)
+            work_sheet.add_image(xlimg, f"{img_col_letter}{row_idx}")
+
+        # 이미지 셀도 테두리만
+        work_sheet.cell(row=row_idx, column=9).border = body_border
+        if (row_idx % 2) == 0:
+            work_sheet.cell(row=row_idx, column=9).fill = band_fill
+
+        row_idx += 1
+
+    # ✅ 데이터 추가 후 오토필터 범위 갱신
+    work_sheet.auto_filter.ref = f"A1:I{work_sheet.max_row}"
+    return len(data_results)
+
+class WorkbookWriter:
+    """
+    시트 작성(append_to_worksheet)과 최종 저장을 전용 스레드에서 처리.
+    크롤링 스레드는 submit() 으로 결과만 넘기고 바로 다음 상점으로 넘어간다.
+    대기열이 max_pending 개로 차면 submit() 이 기다리므로 메모리는 일정 이상 늘지 않는다.
+    """
+    _SAVE = object()
+
+    def __init__(self, work_book: Workbook, work_sheet: Worksheet, max_pending: int = 2,
+                 log: Callable[[str], None] = print, profiler: Optional[RunProfiler] = None,
+                 period: Optional[str] = None):
+        self.work_book = work_book
+        self.profiler = profiler
+        # period 가 있으면 저장 직전에 전체 결과로 summary 시트를 만든다
+        self.period = period
+        self.items: list[ItemRow] = []
+        self.work_sheet = work_sheet
+        self.log = log
+        self._q: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._loop, name="xlsx-writer", daemon=True)
+        self.submitted = 0
+        self.written = 0
+        self.saved_path = ""
+        self.save_sec = 0.0
+        self.max_lag_sec = 0.0  # submit → 시트 반영까지 걸린 최대 시간
+
+    def start(self) -> "WorkbookWriter":
+        self._thread.start()
+        return self
+
+    @property
+    def pending(self) -> int:
+        """ 넘겨받았지만 아직 시트에 반영되지 않은 상점 수 """
+        return self.submitted - self.written
+
+    def submit(self, shop: str, results: list[ItemRow], images: list[Image]) -> None:
+        self.submitted += 1
+        self._q.put((shop, list(results), list(images), time.monotonic()))
+
+    def finish(self, xlsx_path: str) -> bool:
+        """ 남은 시트 작성 후 저장까지 기다림. 저장 성공 여부 반환 """
+        self._q.put((self._SAVE, xlsx_path))
+        self._thread.join()
+        return self.saved_path == xlsx_path
+
+    def _loop(self):
+        while True:
+            item = self._q.get()
+            if item[0] is self._SAVE:
+                self._save(item[1])
+                return
+            shop, results, images, queued_at = item
+            try:
+                with self._section(f"write_{shop}"):
+                    rows = append_to_worksheet(self.work_sheet, results, images)
+            except Exception as e:
+                rows = 0
+                self.log(f"[ERROR] {shop} 시트 작성 실패: {e!r}")
+            self.items.extend(results)
+            self.written += 1
+            lag = time.monotonic() - queued_at
+            self.max_lag_sec = max(self.max_lag_sec, lag)
+            self.log(f"[WRITE] {shop} 시트 반영 {rows}행 (지연 {lag:.1f}초, 남은 대기 {self.pending}개)")
+
+    def _section(self, name: str):
+        return self.profiler.section(name) if self.profiler is not None else nullcontext()
+
+    def _save(self, xlsx_path: str):
+        started = time.monotonic()
+        if self.period:
+            try:
+                t0 = time.monotonic()
+                with self._section("summary"):
+                    summary = add_summary_sheet(self.work_book, self.items, self.period, run_key(xlsx_path))
+                self.log(f"[SUMMARY] {len(self.items)}행 → 요약 {len(summary)}행 ({time.monotonic() - t0:.2f}초)")
+            except Exception as e:
+                self.log(f"[WARN] 요약 시트 생성 실패: {e!r}")
+        try:
+            with self._section("save"):
+                autosize_text_columns(self.work_sheet, skip_letters={"I"})
+                self.work_book.save(xlsx_path)
+            self.saved_path = xlsx_path
+        except Exception as e:
+            self.log(f"[WARN] 파일 저장 실패: {e}")
+        self.save_sec = time.monotonic() - started
+
+def save_shard(xlsx_path: str, shops: list[tuple[str, list[ItemRow], list[Image]]],
+               period: Optional[str] = None) -> tuple[int, float, int]:
+    """
+    상점 묶음 하나를 독립된 엑셀 파일로 저장(워커 프로세스에서 실행).
+    반환값: (행 수, 저장까지 걸린 초, 파일 크기)
+    """
+    started = time.monotonic()
+    work_book, work_sheet = new_ranking_workbook()
+    rows = 0
+    items: list[ItemRow] = []
+    for _, results, images in shops:
+        rows += append_to_worksheet(work_sheet, results, images)
+        items.extend(results)
+    if period:
+        add_summary_sheet(work_book, items, period, run_key(xlsx_path))
+    autosize_text_columns(work_sheet, skip_letters={"I"})
+    work_book.save(xlsx_path)
+    return rows, time.monotonic() - started, os.path.getsize(xlsx_path)
+
+def save_index_workbook(xlsx_path: str, entries: list[tuple[str, int, str, str]],
+                        items: list[ItemRow], period: Optional[str] = None) -> None:
+    """ 상점 → 분할 파일 목록(상대 경로 하이퍼링크) + 전체 summary 시트만 담은 가벼운 인덱스 워크북 """
+    work_book = Workbook()
+    work_sheet: Worksheet = work_book.active
+    work_sheet.title = "index"
+    work_sheet.append(INDEX_HEADERS)
+    header_fill = PatternFill("solid", fgColor="F3F6FA")
+    header_font = Font(bold=True, color="1F2937")
+    for cell in work_sheet[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+    work_sheet.freeze_panes = "A2"
+
+    for shop, count, shard_path, status in entries:
+        work_sheet.append([shop, count, os.path.basename(shard_path), status])
+        c = work_sheet.cell(row=work_sheet.max_row, column=3)
+        # 인덱스와 분할 파일은 같은 폴더에 있으므로 파일명만으로 링크
+        c.hyperlink = os.path.basename(shard_path)
+        c.style = "Hyperlink"
+    for letter, width in zip("ABCD", (24, 8, 40, 10)):
+        work_sheet.column_dimensions[letter].width = width
+    work_sheet.auto_filter.ref = f"A1:D{work_sheet.max_row}"
+
+    if period:
+        add_summary_sheet(work_book, items, period, run_key(xlsx_path))
+    work_book.save(xlsx_path)
+
+class ShardedWorkbookWriter:
+    """
+    WorkbookWriter 와 같은 사용법(submit/pending/finish)으로, 결과를 여러 엑셀 파일로 나눠 저장.
+    상점 수(max_shops) 또는 이미지 용량(max_mb) 기준을 넘으면 그 묶음을 <이름>_partNN.xlsx 로
+    워커 프로세스에서 바로 저장하므로, 실행이 길어져도 파일 하나의 크기와 저장 시간은 일정하다.
+    finish() 는 남은 묶음 저장을 기다린 뒤 xlsx_path 에 인덱스 워크북을 만든다.
+    """
+    def __init__(self, xlsx_path: str, max_shops: int = 0, max_mb: float = 0,
+                 log: Callable[[str], None] = print, profiler: Optional[RunProfiler] = None,
+                 period: Optional[str] = None, workers: int = SHARD_WORKERS):
+        self.base = os.path.splitext(xlsx_path)[0]
+        self.max_shops = max_shops
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.log = log
+        self.profiler = profiler
+        self.period = period
+        self.workers = workers
+        self.items: list[ItemRow] = []       # 인덱스의 전체 summary 용(이미지 제외)
+        self.entries: list[list] = []        # [shop, 행 수, 분할 파일, 상태]
+        self._buf: list[tuple[str, list[ItemRow], list[Image]]] = []
+        self._buf_bytes = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._retired: list[ProcessPoolExecutor] = []  # 깨진 풀(finish 에서 정리)
+        self._parts = 0
+        self._shards: dict[str, list] = {}   # 저장이 끝나지 않은 분할 파일 → 상점 묶음(실패 시 재시도용)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.saved_path = ""
+        self.save_sec = 0.0
+        self.max_lag_sec = 0.0  # 분할 저장 요청 → 파일 저장 완료까지 걸린 최대 시간
+
+    def start(self) -> "ShardedWorkbookWriter":
+        return self
+
+    @property
+    def pending(self) -> int:
+        """ 넘겨받았지만 아직 파일로 저장되지 않은 상점 수 """
+        return self.submitted - self.written
+
+    def submit(self, shop: str, results: list[ItemRow], images: list[Image]) -> None:
+        self.submitted += 1
+        self.items.extend(results)
+        self._buf.append((shop, list(results), list(images)))
+        self._buf_bytes += sum(len(img.img_bytes) for img in images) + ROW_OVERHEAD_BYTES * len(results)
+        if (self.max_shops and len(self._buf) >= self.max_shops) or \
+                (self.max_bytes and self._buf_bytes >= self.max_bytes):
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buf:
+            return
+        self._parts += 1
+        shard_path = f"{self.base}_part{self._parts:02d}.xlsx"
+        shops, size = self._buf, self._buf_bytes
+        self._buf, self._buf_bytes = [], 0
+        for shop, results, _ in shops:
+            self.entries.append([shop, len(results), shard_path, "pending"])
+        with self._lock:
+            self._shards[shard_path] = shops
+        try:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            future = self._pool.submit(save_shard, shard_path, shops, self.period)
+        except Exception as e:
+            # BrokenProcessPool 등: 묶음은 _shards 에 남겨 finish() 에서 현재 프로세스로 저장.
+            # 크롤링 루프까지 올리지 않는다(방금 넘긴 상점의 실패가 아님). 다음 묶음은 새 풀로 시도
+            self.log(f"[WARN] {os.path.basename(shard_path)} 저장 요청 실패, 종료 시 다시 저장: {e!r}")
+            if self._pool is not None:
+                self._retired.append(self._pool)
+                self._pool = None
+            return
+        queued_at = time.monotonic()
+        future.add_done_callback(lambda f: self._on_saved(f, shard_path, queued_at))
+        self.log(f"[SHARD] {os.path.basename(shard_path)} 저장 시작 (상점 {len(shops)}개, 약 {size / 1024 / 1024:.1f}MB)")
+
+    def _on_saved(self, future: Future, shard_path: str, queued_at: float) -> None:
+        try:
+            rows, sec, size = future.result()
+        except Exception as e:
+            # 프로세스 오류 등 → finish() 에서 현재 프로세스로 다시 저장
+            self.log(f"[WARN] {os.path.basename(shard_path)} 저장 실패: {e!r}")
+            return
+        with self._lock:
+            shops = self._shards.pop(shard_path, [])
+            self.written += len(shops)
+        lag = time.monotonic() - queued_at
+        self.max_lag_sec = max(self.max_lag_sec, lag)
+        self._mark(shard_path, "saved")
+        self.log(f"[SHARD] {os.path.basename(shard_path)} 저장 완료 {rows}행, {size / 1024 / 1024:.1f}MB "
+                 f"(저장 {sec:.1f}초, 지연 {lag:.1f}초, 남은 대기 {self.pending}개)")
+
+    def _mark(self, shard_path: str, status: str) -> None:
+        for entry in self.entries:
+            if entry[2] == shard_path:
+                entry[3] = status
+
+    def _section(self, name: str):
+        return self.profiler.section(name) if self.profiler is not None else nullcontext()
+
+    def finish(self, xlsx_path: str) -> bool:
+        """ 남은 묶음 저장 → 모든 분할 파일 저장 대기 → 인덱스 워크북 저장. 저장 성공 여부 반환 """
+        started = time.monotonic()
+        self._flush()
+        # 완료 콜백은 풀 관리 스레드에서 실행되므로 shutdown(wait) 이후엔 모두 반영돼 있다
+        for pool in self._retired + ([self._pool] if self._pool is not None else []):
+            pool.shutdown(wait=True)
+        self._pool = None
+        self._retired = []
+        # 워커 프로세스에서 실패한 묶음은 여기서 한 번 더 저장
+        with self._lock:
+            failed = list(self._shards.items())
+        for shard_path, shops in failed:
+            try:
+                with self._section(f"save_{os.path.basename(shard_path)}"):
+                    rows, _, size = save_shard(shard_path, shops, self.period)
+                self.written += len(shops)
+                self._mark(shard_path, "saved")
+                self.log(f"[SHARD] {os.path.basename(shard_path)} 재저장 {rows}행, {size / 1024 / 1024:.1f}MB")
+            except Exception as e:
+                self._mark(shard_path, "failed")
+                self.log(f"[WARN] {os.path.basename(shard_path)} 재저장 실패: {e!r}")
+        try:
+            with self._section("save_index"):
+                save_index_workbook(xlsx_path, [tuple(e) for e in self.entries], self.items, self.period)
+            self.saved_path = xlsx_path
+        except Exception as e:
+            self.log(f"[WARN] 인덱스 파일 저장 실패: {e}")
+        self.save_sec = time.monotonic() - started
+        return self.saved_path == xlsx_path
+